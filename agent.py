@@ -8,39 +8,255 @@ OPTIMIZED: Reduced redundant calls, shorter prompts, smarter navigation handling
 import os
 import sys
 import re
-from typing import Dict, List, Optional, Tuple, Any
+import json
+import select
+import signal
+import threading
+import weakref
+from typing import Deque, Dict, List, Optional, Tuple, Any
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from commands.registry import get_system_prompt_commands
+from llm_cache import ResponseCache, SemanticCache
+from repl_input import make_reader
+from urllib.parse import urlparse
 
-try:
-    from groq import Groq
-except ImportError:
-    raise ImportError("groq package required. Install with: pip install groq")
-
-try:
-    from main import BrowserAgent
-except ImportError:
-    raise ImportError(
-        "Cannot import BrowserAgent. To fix circular dependency:\n"
-        "1. Move BrowserAgent to browser_agent.py, OR\n"
-        "2. Ensure main.py is in sys.path"
-    )
+class SimpleConsole:
+    """Plain stdout console used when Rich/browser package is unavailable."""
+    def print(self, *args, **kwargs):
+        print(*args)
+    def input(self, prompt=""):
+        return input(prompt)
+
+
+class _LazyConsole:
+    """
+    Stand-in for the shared Rich console that imports it on first use.
+    Importing `browser` pulls in Rich and Playwright, which --help and
+    plain `import agent` never need.
+    """
+    _console = None
+    
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            try:
+                from browser import console as shared_console
+            except ImportError:
+                shared_console = SimpleConsole()
+            _LazyConsole._console = shared_console
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+# Error-path output bypasses Rich: no markup parsing or width measurement
+_STDERR_COLOR = sys.stderr.isatty()
+
+# Tracebacks on error paths; read once at import
+_DEBUG = bool(os.environ.get("DEBUG"))
+
+
+def _err(msg: str):
+    """Write an error line to stderr (red on a terminal)."""
+    sys.stderr.write(f"\x1b[31m{msg}\x1b[0m\n" if _STDERR_COLOR else f"{msg}\n")
+
+
+def _warn(msg: str):
+    """Write a warning line to stderr (yellow on a terminal)."""
+    sys.stderr.write(f"\x1b[33m{msg}\x1b[0m\n" if _STDERR_COLOR else f"{msg}\n")
+
+
+# Heavy runtime dependencies (Groq SDK -> httpx/pydantic, BrowserAgent -> Playwright),
+# imported on first agent construction so `import agent` stays cheap
+_Groq = None
+_BrowserAgent = None
+_build_command_registry = None
+
+
+def _load_runtime_deps():
+    """Import Groq, BrowserAgent and build_command_registry once, on first use."""
+    global _Groq, _BrowserAgent, _build_command_registry
+    
+    if _Groq is None:
+        try:
+            from groq import Groq as _Groq
+        except ImportError:
+            raise ImportError("groq package required. Install with: pip install groq")
+    
+    if _BrowserAgent is None:
+        try:
+            from main import BrowserAgent as _BrowserAgent
+        except ImportError:
+            raise ImportError(
+                "Cannot import BrowserAgent. To fix circular dependency:\n"
+                "1. Move BrowserAgent to browser_agent.py, OR\n"
+                "2. Ensure main.py is in sys.path"
+            )
+    
+    if _build_command_registry is None:
+        try:
+            from commands import build_command_registry as _build_command_registry
+        except ImportError:
+            raise ImportError("commands module required")
+
+
+# Command registries keyed by id(browser). Entries must be dropped before the
+# browser is closed so a recycled id never maps to a dead browser's methods.
+_REGISTRY_CACHE: Dict[int, Dict[str, Any]] = {}
+
+
+def _registry_for(browser) -> Dict[str, Any]:
+    """Return a copy of the (memoized) command registry for this browser."""
+    registry = _REGISTRY_CACHE.get(id(browser))
+    if registry is None:
+        registry = _REGISTRY_CACHE[id(browser)] = _build_command_registry(browser)
+    return dict(registry)
+
+
+def _close_browser(browser) -> bool:
+    """
+    Finalizer callback for an owned browser. Must not reference the agent,
+    or the agent could never be collected.
+    """
+    _REGISTRY_CACHE.pop(id(browser), None)
+    try:
+        browser.close()
+        return True
+    except Exception as e:
+        console.print(f"[dim]Browser close failed: {e}[/dim]")
+        return False
+
+
+# Runs LLM calls off the main thread so they overlap with browser/console work.
+# Playwright's sync API stays on the main thread; only network I/O moves here.
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm")
+
+# Keep-alive HTTP client shared by every Groq client in the process
+_HTTP_CLIENT = None
+
+
+def _get_http_client():
+    """Return the shared keep-alive HTTP client, creating it on first use."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        import httpx  # Installed with the groq SDK
+        
+        limits = httpx.Limits(
+            max_keepalive_connections=5,
+            max_connections=10,
+            keepalive_expiry=30.0
+        )
+        try:
+            _HTTP_CLIENT = httpx.Client(limits=limits, http2=True, timeout=30.0)
+        except ImportError:
+            # HTTP/2 needs the optional 'h2' package
+            _HTTP_CLIENT = httpx.Client(limits=limits, timeout=30.0)
+    return _HTTP_CLIENT
+
+
+# Tagged lines of an LLM response, e.g. "ACTION: click 3" (one match per line)
+_RESPONSE_LINE_RE = re.compile(
+    r'^[ \t]*(FINISH|ACTION|THINKING|COMMAND|REASONING)[ \t]*:[ \t]*(.*)$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+# Opening Markdown fence some models wrap JSON in (outside JSON mode, e.g. streaming)
+_JSON_FENCE_RE = re.compile(r'^```[a-zA-Z]*[ \t]*\n?')
+_JSON_DECODER = json.JSONDecoder()
 
-try:
-    from browser import console
-except ImportError:
-    class SimpleConsole:
-        def print(self, *args, **kwargs):
-            print(*args)
-        def input(self, prompt=""):
-            return input(prompt)
-    console = SimpleConsole()
 
-try:
-    from commands import build_command_registry
-except ImportError:
-    raise ImportError("commands module required")
+def _json_reply_text(response: str) -> Optional[str]:
+    """The reply with any opening code fence removed, if it starts like a JSON object."""
+    text = _JSON_FENCE_RE.sub('', response.strip(), count=1).lstrip()
+    return text if text.startswith('{') else None
+
+
+def _decode_json_reply(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the reply as a dict if it is a JSON object, else None.
+    The first complete object is used, so a closing fence or trailing text
+    after it doesn't matter.
+    """
+    text = _json_reply_text(response)
+    if text is None:
+        return None
+    try:
+        reply, _ = _JSON_DECODER.raw_decode(text)
+    except ValueError:
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+# A finished text-protocol decision line; streaming can stop once one arrives
+_DECISION_LINE_RE = re.compile(
+    r'^[ \t]*(?:FINISH|ACTION|COMMAND)[ \t]*:[^\n]*\S[^\n]*\n',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _reply_complete(partial: str) -> bool:
+    """True once a streamed reply holds a full decision (JSON object or tagged line)."""
+    if _json_reply_text(partial) is not None:
+        return _decode_json_reply(partial) is not None
+    return _DECISION_LINE_RE.search(partial) is not None
+
+
+# Instruction words that say nothing about what the finished page looks like
+_TASK_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'to', 'for', 'on', 'in', 'of', 'and', 'or', 'with', 'at',
+    'by', 'from', 'into', 'then', 'me', 'my', 'please', 'go', 'goto', 'open',
+    'navigate', 'visit', 'search', 'find', 'look', 'up', 'show', 'page',
+    'website', 'site', 'www', 'com', 'http', 'https',
+})
+_TASK_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Only "take me to X" tasks can be finished from the page title alone
+_NAV_TASK_RE = re.compile(r'^(?:go(?: to)?|goto|visit|open|navigate to)\b', re.IGNORECASE)
+# Words asking for something to be done once there (or chaining another step);
+# a matching title proves nothing about those
+_TASK_ACTION_WORDS = frozenset({
+    'sign', 'signin', 'signup', 'log', 'login', 'logout', 'register', 'add',
+    'click', 'press', 'type', 'fill', 'enter', 'submit', 'send', 'post',
+    'search', 'find', 'look', 'buy', 'purchase', 'order', 'book', 'pay',
+    'checkout', 'create', 'delete', 'remove', 'edit', 'update', 'save',
+    'download', 'upload', 'subscribe', 'select', 'choose', 'play', 'watch',
+    'read', 'write', 'reply', 'comment', 'like', 'follow', 'share', 'check',
+    'compare', 'apply', 'install', 'get', 'then', 'and',
+})
+
+
+# Tasks that are a single command in disguise run without any LLM call.
+# (pattern, command template for Match.expand)
+_DIRECT_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), template) for pattern, template in (
+    (r'^(?:go(?: to)?|goto|visit|open|navigate to)\s+(\S+\.[a-z]{2,}\S*)$', r'go \1'),
+    (r'^(?:go )?back$', 'back'),
+    (r'^(?:go )?forward$', 'forward'),
+    (r'^(?:refresh|reload)(?: (?:the )?page)?$', 'refresh'),
+    (r'^scan(?: (?:the )?page)?$', 'scan'),
+    (r'^scan (?:for |the )?(buttons|inputs|links)$', r'scan \1'),
+))
+
+
+def _direct_command(task: str) -> Optional[str]:
+    """The command for a task that needs no planning, or None."""
+    task = task.strip().rstrip('.!')
+    for pattern, template in _DIRECT_PATTERNS:
+        match = pattern.match(task)
+        if match:
+            return match.expand(template)
+    return None
+
+
+_PAGE_STATE_JS = "() => ({url: location.href, title: document.title})"
+
+# Sent only on a parse-error retry, so the per-step system prompt stays short
+FORMAT_EXAMPLE = (
+    'Example:\n'
+    '{"thinking": "The search box must be found first.", "action": "scan inputs"}'
+)
 
 
 class ErrorType(Enum):
@@ -52,6 +268,14 @@ class ErrorType(Enum):
     UNKNOWN = "unknown"
 
 
+# Error message keywords; alternatives are tried in order, so earlier ones win
+_ERROR_CLASSIFIER = re.compile(
+    r'^(?:.*?(intercept)|.*?(timeout)|.*?(not attached|detached))',
+    re.IGNORECASE | re.DOTALL
+)
+_ERROR_TYPES = (ErrorType.OVERLAY, ErrorType.TIMEOUT, ErrorType.STALE)  # By group number
+
+
 @dataclass
 class ExecutionResult:
     """Result of command execution with full context."""
@@ -64,6 +288,16 @@ class ExecutionResult:
     page_url: Optional[str] = None
 
 
+@dataclass(slots=True)
+class ParsedResponse:
+    """One LLM reply: an action to run, a finish, or a format error."""
+    done: bool = False
+    thinking: str = ''
+    command: str = ''
+    finish_message: str = ''
+    error: Optional[str] = None
+
+
 class LLMBrowserAgent:
     """
     Intelligent browser agent with single-step execution.
@@ -75,19 +309,58 @@ class LLMBrowserAgent:
     - Comprehensive error recovery
     """
     
+    # Class-level defaults so close() works on partially constructed instances
+    browser: Optional[Any] = None
+    response_cache: Optional[ResponseCache] = None
+    semantic_cache: Optional[SemanticCache] = None
+    _owns_browser: bool = False
+    _finalizer: Optional[weakref.finalize] = None
+    _SYSTEM_PROMPT_CACHE: Optional[str] = None
+    
     MAX_CONVERSATION_MESSAGES = 10
-    DEFAULT_MODEL = "openai/gpt-oss-120b"
+    MAX_STORED_ASSISTANT_CHARS = 2048  # Longer replies keep only their decision line
+    HISTORY_ASSISTANT_CHARS = 150  # Stored (and sent) size of each history message
+    HISTORY_USER_CHARS = 500
+    
+    # Model tiers: 'instant' for trivial steps, 'fast70b' is speculative-decoding 70B
+    SPEED_MAP = {
+        "instant": "llama-3.1-8b-instant",
+        "balanced": "openai/gpt-oss-120b",
+        "fast70b": "llama-3.3-70b-specdec",
+    }
+    DEFAULT_TIER = "balanced"
+    DEFAULT_MODEL = SPEED_MAP[DEFAULT_TIER]
+    TRIVIAL_COMMANDS = frozenset({'go', 'scan', 'press'})
+    AUTO_DOWNGRADE_AFTER = 3  # Consecutive successful trivial steps before using 'instant'
     DEFAULT_MAX_STEPS = 25
     MAX_CONSECUTIVE_FAILURES = 3
+    MAX_FEEDBACK_REPEATS = 2  # Identical feedback in a row before the task is declared stuck
+    TEMPERATURE = 0
+    JSON_MODE = True  # Replies are {"thinking", "action"|"finish"} objects
+    SPECULATE = True  # Prefetch the next step during predictable commands
+    # Completion budgets: THINKING + ACTION fits well under STEP_MAX_TOKENS.
+    # Sized for the default gpt-oss-120b, a reasoning model whose reasoning
+    # tokens count against max_tokens; a tighter cap truncates the JSON
+    DEFAULT_MAX_TOKENS = 150
+    STEP_MAX_TOKENS = 150
+    EXTENDED_MAX_TOKENS = 256  # Retries, recovery, and likely FINISH summaries
+    CACHE_MAX_TEMPERATURE = 0.3  # Above this, responses aren't repeatable enough to cache
     
     def __init__(
         self,
         api_key: Optional[str] = None,
         headless: bool = False,
         model: Optional[str] = None,
-        browser_agent: Optional[Any] = None
+        browser_agent: Optional[Any] = None,
+        use_cache: bool = True,
+        tier: str = DEFAULT_TIER,
+        auto_tier: bool = True,
+        semantic_cache: bool = False,
+        stream: bool = False
     ):
         """Initialize LLM Browser Agent with configuration."""
+        _load_runtime_deps()
+        
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         if not self.api_key:
             raise ValueError(
@@ -95,202 +368,293 @@ class LLMBrowserAgent:
                 "or pass api_key parameter."
             )
         
-        self.model = model or os.getenv("GROQ_MODEL", self.DEFAULT_MODEL)
-        self.client = Groq(api_key=self.api_key)
+        if tier not in self.SPEED_MAP:
+            raise ValueError(f"Unknown tier '{tier}'. Choose from: {', '.join(self.SPEED_MAP)}")
+        
+        explicit_model = model or os.getenv("GROQ_MODEL")
+        self.model = explicit_model or self.SPEED_MAP[tier]
+        self.active_model = self.model
+        self.fast_model = os.getenv("GROQ_FAST_MODEL") or self.SPEED_MAP["instant"]
+        # Only switch models automatically when the user didn't pick one
+        self.auto_tier = auto_tier and not explicit_model and self.model != self.fast_model
+        self._trivial_streak = 0
+        self.stream = stream
+        self.client = _Groq(api_key=self.api_key, http_client=_get_http_client())
         
-        self.browser = browser_agent if browser_agent is not None else BrowserAgent(headless=headless)
-        self._owns_browser = browser_agent is None
+        if browser_agent is not None:
+            self._adopt_browser(browser_agent, owned=False)
+        else:
+            self._adopt_browser(_BrowserAgent(headless=headless), owned=True)
         
         try:
-            self.commands = build_command_registry(self.browser)
+            self._set_commands(_registry_for(self.browser))
         except Exception as e:
-            if self._owns_browser:
-                self.browser.close()
+            self._safe_close()
             raise RuntimeError(f"Failed to build command registry: {e}")
         
-        self.conversation_history: List[Dict[str, str]] = []
+        self._interrupted = False  # Set by the SIGINT handler during a task
+        self._degraded = False  # Set when a reset leaves no usable browser
+        self._task_queue: Deque[str] = deque()  # REPL input read ahead of execution
+        self._reset_conversation()
         self.api_calls_made = 0
         self.consecutive_failures = 0
         self.step_count = 0
+        self.cache_hits = 0
+        self.shortcut_hits = 0
+        self.speculation_hits = 0
+        self._context_cache: Optional[Tuple[str, str]] = None  # Valid until the next command
         
         self.system_prompt = self._build_system_prompt()
+        # Session-constant request prefix; only the history after it changes
+        # between calls, so providers that cache prompt prefixes can reuse it
+        self._system_messages: Tuple[Dict[str, str], ...] = (
+            {"role": "system", "content": self.system_prompt},
+        )
+        
+        if use_cache and self.TEMPERATURE <= self.CACHE_MAX_TEMPERATURE:
+            self.response_cache = ResponseCache(path=ResponseCache.DEFAULT_PATH)
+        else:
+            self.response_cache = None
+        
+        # Opt-in: needs numpy + sentence-transformers and loads an embedding model
+        if semantic_cache and self.TEMPERATURE <= self.CACHE_MAX_TEMPERATURE:
+            self.semantic_cache = SemanticCache(path=SemanticCache.DEFAULT_PATH)
+        
+    
+    def _reset_conversation(self):
+        """Start a fresh conversation; old messages fall off automatically."""
+        self.conversation_history: Deque[Dict[str, str]] = deque(
+            maxlen=self.MAX_CONVERSATION_MESSAGES
+        )
+    
+    def _remember_assistant(self, content: str):
+        """Record assistant reply, trimming long ones to the ACTION/FINISH line."""
+        if len(content) > self.MAX_STORED_ASSISTANT_CHARS:
+            reply = _decode_json_reply(content)
+            if reply is not None:
+                decision = {k: reply[k] for k in ('action', 'finish') if reply.get(k)}
+                if decision:
+                    content = json.dumps(decision)
+            
+            decisions = [
+                match.group(0).strip() for match in _RESPONSE_LINE_RE.finditer(content)
+                if match.group(1).upper() in ('ACTION', 'COMMAND', 'FINISH')
+            ]
+            if decisions:
+                content = decisions[-1]
+        
+        # Stored already truncated, so history is sent as-is every step
+        if len(content) > self.HISTORY_ASSISTANT_CHARS:
+            content = content[:self.HISTORY_ASSISTANT_CHARS] + "..."
         
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": content
+        })
+    
+    def _user_entry(self, content: str) -> Dict[str, str]:
+        """History entry for a user/feedback message, truncated heavily to keep context small."""
+        if len(content) > self.HISTORY_USER_CHARS:
+            content = content[:self.HISTORY_USER_CHARS] + "...[msg truncated]"
+        
+        return {
+            "role": "user",
+            "content": content
+        }
+    
+    def _remember_user(self, content: str):
+        """Record a user/feedback message."""
+        self.conversation_history.append(self._user_entry(content))
     
     def _build_system_prompt(self) -> str:
-        """Build concise system prompt for intelligent execution."""
-        from commands.registry import get_system_prompt_commands
+        """
+        Build concise system prompt for intelligent execution.
+        Built once per process and never varies per task (the task goes in the
+        first user message), so every call shares a cacheable prefix.
+        """
+        if LLMBrowserAgent._SYSTEM_PROMPT_CACHE is not None:
+            return LLMBrowserAgent._SYSTEM_PROMPT_CACHE
+        
         commands_section = get_system_prompt_commands()
         
-        return f"""You are a browser automation agent. Execute ONE command per response.
-
-    RESPONSE FORMAT (required):
-    THINKING: <brief analysis>
-    ACTION: <command>
+        LLMBrowserAgent._SYSTEM_PROMPT_CACHE = f"""You are a browser automation agent. Reply with ONE JSON object per turn:
+{{"thinking": "<one sentence>", "action": "<command>"}}
+When the whole task is done, reply instead:
+{{"thinking": "<one sentence>", "finish": "<summary>"}}
 
-    When task complete:
-    THINKING: <brief explanation>
-    FINISH: <summary>
+{commands_section}
 
-    AVAILABLE COMMANDS:
-
-    Navigation:
-    - go <url>- Navigate to URL
-    - back / forward / refresh  - Browser navigation
-    - new_tab <url>- Open new tab
-    - switch_tab <N>- Switch to tab N
-    - close_tab- Close current tab
-
-    Understanding:
-    - read_page [focus] - Extract text (focus=overview/content/forms/navigation/all)
-    - scan [type] - Find elements (type=buttons/inputs/links/all)
-    - screenshot [name] - Capture screenshot
-
-    Interaction:
-    - click <N>  - Click element N
-    - type <N> "text" - Type into element N
-    - press <key>- Press key (Enter, Tab, Escape, ArrowDown, etc.)
-    - hover <N>- Hover over element N
-    - check/uncheck <N>- Toggle checkbox N
-    - scroll_to <N>- Scroll to element N
-
-    Info:
-    - url / title              - Show current page info
-
-    DONT EXECUTE: read_page [focus], scan [type] EXECUTE IN THIS FORMAT: read_page overview or scan buttons etc.
-
-    CORE PRINCIPLES:
-
-    ACT EFFICIENTLY
-    - Only use read_page when you need to READ content (articles, results, instructions, unfamiliar pages)
-    - Use scan to find buttons/inputs before clicking/typing. 
-    - Remember to rescan when the page changes.
-    - You need to press Enter after typing anything. Type does NOT auto-submit forms.
-    - Use the most direct command to achieve/reach closer to your goal. Do not use unnecessary commands. 
-    - Avoid using very specific urls in go. Use common urls (google.com, amazon.com) or given ones.
-    - Only FINISH: when full objective accomplished
-    - FINISH is not a command! NEVER WRITE Command: FINISH! ALWAYS use FINISH:"""
+Rules: <selector> = element number from the latest scan; rescan after page changes. \
+Fill <> and [] with values (scan inputs, read_page content). type does not submit; press Enter. \
+Use read_page only to read text. finish is not a command."""
+        return LLMBrowserAgent._SYSTEM_PROMPT_CACHE
         
         
-    def _get_page_context(self) -> Tuple[Optional[str], Optional[str]]:
-        """Get current page title and URL safely."""
+    def _page_state(self) -> Tuple[Optional[str], Optional[str]]:
+        """Read (title, url) in one browser round-trip."""
         try:
-            title = self.browser.page.title() or "No title"
-            url = self.browser.page.url
-            return title, url
+            state = self.browser.page.evaluate(_PAGE_STATE_JS)
+            return state['title'], state['url']
         except Exception:
+            # evaluate can fail while a navigation is committing
+            try:
+                return self.browser.page.title(), self.browser.page.url
+            except Exception:
+                return None, None
+    
+    def _get_page_context(self) -> Tuple[Optional[str], Optional[str]]:
+        """Get current page title and URL safely (cached until the next command runs)."""
+        cached = self._context_cache
+        if cached is not None:
+            return cached
+        
+        title, url = self._page_state()
+        if url is None:
+            return None, None
+        return self._store_page_context(title, url)
+    
+    def _store_page_context(self, title: Optional[str], url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Remember (title, url) observed since the last command."""
+        if url is None:
             return None, None
+        self._context_cache = (title or "No title", url)
+        return self._context_cache
     
-    def _parse_response(self, response: str) -> Dict[str, Any]:
+    def _parse_response(self, response: str) -> ParsedResponse:
         """Parse LLM response into structured command or done signal."""
-        lines = [line.strip() for line in response.strip().split('\n') if line.strip()]
-        
-        if not lines:
-            return {'error': 'Empty response'}
+        if not response.strip():
+            return ParsedResponse(error='Empty response')
         
         thinking = ''
         action = ''
         finish = ''
         
-        for line in lines:
-            upper_line = line.upper()
-            
-            # Check for FINISH
-            if upper_line.startswith('FINISH:'):
-                finish = line.split(':', 1)[1].strip() if ':' in line else ''
-            # Check for ACTION
-            elif upper_line.startswith('ACTION:'):
-                action = line.split(':', 1)[1].strip() if ':' in line else ''
-            # Check for THINKING
-            elif upper_line.startswith('THINKING:'):
-                thinking = line.split(':', 1)[1].strip() if ':' in line else ''
-            # Legacy COMMAND support
-            elif upper_line.startswith('COMMAND:'):
-                action = line.split(':', 1)[1].strip() if ':' in line else ''
-            # Legacy REASONING support
-            elif upper_line.startswith('REASONING:'):
-                thinking = line.split(':', 1)[1].strip() if ':' in line else ''
+        reply = _decode_json_reply(response)
+        if reply is not None:
+            thinking = str(reply.get('thinking') or '').strip()
+            action = str(reply.get('action') or reply.get('command') or '').strip()
+            finish = str(reply.get('finish') or '').strip()
+        
+        # Text protocol fallback (non-JSON models, UI prompts)
+        for match in (() if reply is not None else _RESPONSE_LINE_RE.finditer(response)):
+            tag = match.group(1).upper()
+            body = match.group(2).strip()
+            
+            if tag == 'FINISH':
+                finish = body
+                if finish:
+                    break
+            # COMMAND / REASONING are legacy aliases
+            elif tag in ('ACTION', 'COMMAND'):
+                action = body
+            else:
+                thinking = body
         
         # Check if task is finished
         if finish:
-            return {
-                'done': True,
-                'thinking': thinking,
-                'finish_message': finish
-            }
+            return ParsedResponse(done=True, thinking=thinking, finish_message=finish)
         
         # Must have an action
         if not action:
-            return {'error': 'No ACTION or FINISH found in response'}
+            return ParsedResponse(error='No action or finish found in response')
         
         # Check for invalid "DONE" as action
         if action.upper() == 'DONE':
-            return {
-                'error': 'Invalid response: Use "FINISH:" not "ACTION: DONE"'
-            }
+            return ParsedResponse(error='Invalid response: Use "finish" not action "DONE"')
         
-        return {
-            'done': False,
-            'thinking': thinking,
-            'command': action
-        }
+        return ParsedResponse(thinking=thinking, command=action)
+    
+    # Commands whose first argument is an element number from a scan
+    _ELEMENT_COMMANDS = frozenset({
+        'type', 'click', 'hover', 'scroll_to', 'double_click',
+        'right_click', 'select', 'check', 'uncheck', 'info'
+    })
+    
+    def _set_commands(self, commands: Dict[str, Any]):
+        """Install command registry and precompute lookups used by validation."""
+        self.commands = commands
+        self._commands_set = frozenset(commands)
+        self._sorted_commands_str = ', '.join(sorted(commands))
     
-    def _validate_command(self, command_str: str) -> Tuple[bool, str]:
-        """Validate command syntax and prerequisites."""
+    def _check_element_args(self, cmd: str, args: List[str]) -> Tuple[bool, str]:
+        """Element commands need the number of a scanned element first."""
+        if not args:
+            return False, f"'{cmd}' requires element number"
+        
+        try:
+            element_idx = int(args[0])
+        except ValueError:
+            return False, f"First argument must be element number (integer)"
+        
+        if element_idx not in self.browser.element_map:
+            available = sorted(self.browser.element_map.keys())
+            if available:
+                return False, f"Element {element_idx} not found. Available: {available[:15]}"
+            else:
+                return False, f"No elements scanned. Use 'scan inputs' or 'scan buttons' first"
+        
+        return True, ""
+    
+    def _check_type_args(self, cmd: str, args: List[str]) -> Tuple[bool, str]:
+        """'type' needs a text field and some text."""
+        ok, error = self._check_element_args(cmd, args)
+        if not ok:
+            return ok, error
+        
+        element_idx = int(args[0])
+        elem_type = self.browser.element_map[element_idx].get('type', '').lower()
+        
+        if elem_type not in ('input', 'textarea'):
+            return False, f"Cannot type into {elem_type}. Use 'scan inputs' to find text fields"
+        
+        if len(args) < 2:
+            return False, f"'type' requires text: type {element_idx} \"your text\""
+        
+        return True, ""
+    
+    def _check_go_args(self, cmd: str, args: List[str]) -> Tuple[bool, str]:
+        """'go' needs a URL."""
+        if not args:
+            return False, "'go' requires URL"
+        return True, ""
+    
+    # Argument checks per command: one dict lookup decides which (if any) run
+    _ARG_VALIDATORS = {
+        **dict.fromkeys(_ELEMENT_COMMANDS, _check_element_args),
+        'type': _check_type_args,
+        'go': _check_go_args,
+    }
+    
+    def _validate_command(self, command_str: str) -> Tuple[bool, str, Optional[List[str]]]:
+        """
+        Validate command syntax and prerequisites.
+        Returns (is_valid, error_msg, parts); parts is None when invalid.
+        """
         try:
             parts = self.browser._parse_command_line(command_str)
         except Exception as e:
-            return False, f"Failed to parse: {str(e)}"
+            return False, f"Failed to parse: {str(e)}", None
         
         if not parts:
-            return False, "Empty command"
+            return False, "Empty command", None
         
         cmd = parts[0].lower()
-        args = parts[1:]
         
-        if cmd not in self.commands:
-            available = ', '.join(sorted(self.commands.keys()))
-            return False, f"Unknown command '{cmd}'. Available: {available}"
+        if cmd not in self._commands_set:
+            return False, f"Unknown command '{cmd}'. Available: {self._sorted_commands_str}", None
         
-        # Validate element-based commands
-        element_commands = ['type', 'click', 'hover', 'scroll_to', 'double_click', 
-                           'right_click', 'select', 'check', 'uncheck', 'info']
+        validator = self._ARG_VALIDATORS.get(cmd)
+        if validator is not None:
+            is_valid, error_msg = validator(self, cmd, parts[1:])
+            if not is_valid:
+                return False, error_msg, None
         
-        if cmd in element_commands:
-            if not args:
-                return False, f"'{cmd}' requires element number"
-            
-            try:
-                element_idx = int(args[0])
-            except (ValueError, IndexError):
-                return False, f"First argument must be element number (integer)"
-            
-            if element_idx not in self.browser.element_map:
-                available = sorted(self.browser.element_map.keys())
-                if available:
-                    return False, f"Element {element_idx} not found. Available: {available[:15]}"
-                else:
-                    return False, f"No elements scanned. Use 'scan inputs' or 'scan buttons' first"
-            
-            # Special validation for type command
-            if cmd == 'type':
-                elem_meta = self.browser.element_map[element_idx]
-                elem_type = elem_meta.get('type', '').lower()
-                
-                if elem_type not in ['input', 'textarea']:
-                    return False, f"Cannot type into {elem_type}. Use 'scan inputs' to find text fields"
-                
-                if len(args) < 2:
-                    return False, f"'type' requires text: type {element_idx} \"your text\""
-        
-        if cmd == 'go' and not args:
-            return False, "'go' requires URL"
-        
-        return True, ""
+        return True, "", parts
     
     def _execute_command(self, command_str: str) -> ExecutionResult:
         """Execute single command with comprehensive result tracking."""
-        # Validate first (no context needed for validation)
-        is_valid, error_msg = self._validate_command(command_str)
+        # Validate first (no context needed for validation); reuses the parse
+        is_valid, error_msg, parts = self._validate_command(command_str)
         if not is_valid:
             return ExecutionResult(
                 success=False,
@@ -302,27 +666,11 @@ class LLMBrowserAgent:
                 page_url=None
             )
         
-        try:
-            parts = self.browser._parse_command_line(command_str)
-        except Exception as e:
-            return ExecutionResult(
-                success=False,
-                output=f"Parse error: {str(e)}",
-                command=command_str,
-                page_changed=False,
-                error_type=ErrorType.VALIDATION,
-                page_title=None,
-                page_url=None
-            )
-        
         cmd = parts[0].lower()
         args = parts[1:]
         
-        # Capture URL before execution (for change detection only)
-        try:
-            url_before = self.browser.page.url
-        except Exception:
-            url_before = None
+        # Anything observed before this command may be stale afterwards
+        self._context_cache = None
         
         # Execute command
         try:
@@ -341,8 +689,8 @@ class LLMBrowserAgent:
             
             # Special handling for title command
             elif cmd == 'title':
-                title = self.browser.page.title()
-                url = self.browser.page.url
+                title, url = self._page_state()
+                self._store_page_context(title, url)
                 return ExecutionResult(
                     success=True,
                     output=f"Page title: {title}",
@@ -377,8 +725,8 @@ class LLMBrowserAgent:
                 extracted_text = self.commands[cmd](focus, save=False, max_chars=max_chars)
                 
                 # Get context once
-                title = self.browser.page.title()
-                url = self.browser.page.url
+                title, url = self._page_state()
+                self._store_page_context(title, url)
                 
                 return ExecutionResult(
                     success=True,
@@ -395,9 +743,7 @@ class LLMBrowserAgent:
                 success = self.commands[cmd](filename)
                 
                 if success:
-                    output = "Screenshot captured successfully"
-                    if filename:
-                        output += f": {filename}"
+                    output = f"Screenshot captured successfully: {filename}" if filename else "Screenshot captured successfully"
                 else:
                     output = "Screenshot failed"
                 
@@ -412,6 +758,13 @@ class LLMBrowserAgent:
             
             # Execute all other commands
             else:
+                # Capture URL before execution (for change detection only);
+                # the read-only branches above never need it
+                try:
+                    url_before = self.browser.page.url
+                except Exception:
+                    url_before = None
+                
                 self.commands[cmd](*args)
                 
                 # Determine if this is a navigation command
@@ -420,7 +773,7 @@ class LLMBrowserAgent:
                     cmd == 'press' and args and args[0].lower() == 'enter'
                 )
                 
-                page_changed = False
+                title = None
                 
                 # Smart wait for navigation commands
                 if is_navigation:
@@ -430,31 +783,34 @@ class LLMBrowserAgent:
                     except Exception:
                         # Timeout is OK - page might not navigate
                         pass
+                    title, url_after = self._page_state()
+                else:
+                    try:
+                        url_after = self.browser.page.url
+                    except Exception:
+                        url_after = None
                 
                 # Check if URL actually changed
-                try:
-                    url_after = self.browser.page.url
-                    page_changed = (url_after != url_before)
-                except Exception:
-                    page_changed = False
+                page_changed = url_after is not None and url_after != url_before
                 
                 # Only get page context if page actually changed
                 if page_changed:
-                    try:
-                        title = self.browser.page.title()
-                        url = url_after
-                    except Exception:
-                        title = "Unknown"
-                        url = url_after or "Unknown"
+                    if title is None:
+                        title = self._page_state()[0] or "Unknown"
+                    url = url_after
+                    self._store_page_context(title, url)
                     
                     # Clear element map on page change
                     if hasattr(self.browser, "element_map"):
                         self.browser.element_map.clear()
                     
-                    output = f"Command '{cmd}' executed successfully"
-                    output += f"\n\nPAGE CHANGED - Previous element IDs are now invalid"
-                    output += f"\nNew page: {title}"
-                    output += f"\nURL: {url}"
+                    output = "\n".join([
+                        f"Command '{cmd}' executed successfully",
+                        "",
+                        "PAGE CHANGED - Previous element IDs are now invalid",
+                        f"New page: {title}",
+                        f"URL: {url}",
+                    ])
                 else:
                     # Fast path - no context needed
                     title = None
@@ -473,73 +829,64 @@ class LLMBrowserAgent:
         except Exception as e:
             error_msg = str(e)
             
-            # Classify error
-            error_type = ErrorType.UNKNOWN
-            if "intercept" in error_msg.lower():
-                error_type = ErrorType.OVERLAY
-            elif "timeout" in error_msg.lower():
-                error_type = ErrorType.TIMEOUT
-            elif "not attached" in error_msg.lower() or "detached" in error_msg.lower():
-                error_type = ErrorType.STALE
+            # Classify error (one compiled match; keyword priority decides ties)
+            match = _ERROR_CLASSIFIER.match(error_msg)
+            error_type = _ERROR_TYPES[match.lastindex - 1] if match else ErrorType.UNKNOWN
             
             # Truncate long errors
             if len(error_msg) > 200:
                 error_msg = error_msg[:200] + "..."
             
-            # Get context on error (helpful for debugging)
-            try:
-                title = self.browser.page.title()
-                url = self.browser.page.url
-            except:
-                title = None
-                url = None
-            
             return ExecutionResult(
                 success=False,
                 output=f"Error: {error_msg}",
                 command=command_str,
                 page_changed=False,
                 error_type=error_type,
-                page_title=title,
-                page_url=url
+                # Failure feedback shows only the output; skip the round-trip
+                page_title=None,
+                page_url=None
             )
         
+    _PRIORITY_TYPES = ('input', 'textarea', 'button', 'link')
+    SCAN_ITEMS_PER_TYPE = 15
+    
     def _format_scan_results(self) -> str:
         """Format scan results with clear structure."""
         if not self.browser.element_map:
             return "SCAN COMPLETE: No interactive elements found on this page"
         
-        by_type: Dict[str, List[Tuple[int, str]]] = {}
+        # Counts come from the map's running histogram; walk entries only until
+        # every priority type has its shown labels.
+        # Labels arrive normalised by the scanner (whitespace collapsed, <= 60 chars).
+        counts = {t.lower(): n for t, n in self.browser.element_map.type_counts.items()}
+        shown: Dict[str, List[str]] = defaultdict(list)
+        limit = self.SCAN_ITEMS_PER_TYPE
+        remaining = sum(min(counts.get(t, 0), limit) for t in self._PRIORITY_TYPES)
         for idx, meta in self.browser.element_map.items():
+            if not remaining:
+                break
             elem_type = meta.get('type', 'unknown').lower()
-            label = meta.get('label', 'no label')
-            label = label[:80].replace('\n', ' ').strip()
-            
-            if elem_type not in by_type:
-                by_type[elem_type] = []
-            by_type[elem_type].append((idx, label))
+            if elem_type in self._PRIORITY_TYPES and len(shown[elem_type]) < limit:
+                shown[elem_type].append(f"  [{idx}] {meta.get('label', 'no label')}")
+                remaining -= 1
         
-        lines = []
-        lines.append(f" SCAN COMPLETE - Found {len(self.browser.element_map)} interactive elements")
+        lines = [f" SCAN COMPLETE - Found {len(self.browser.element_map)} interactive elements"]
         
         # Show inputs and textareas first (most commonly needed)
-        for elem_type in ['input', 'textarea', 'button', 'link']:
-            if elem_type in by_type:
-                items = by_type[elem_type]
-                lines.append(f"\n {elem_type.upper()}S ({len(items)}):")
-                for idx, label in items[:15]:
-                    lines.append(f"  [{idx}] {label}")
-                if len(items) > 15:
-                    lines.append(f"  ... and {len(items)-15} more {elem_type}s")
+        for elem_type in self._PRIORITY_TYPES:
+            count = counts.get(elem_type)
+            if count:
+                lines.append(f"\n {elem_type.upper()}S ({count}):")
+                lines.extend(shown[elem_type])
+                if count > self.SCAN_ITEMS_PER_TYPE:
+                    lines.append(f"  ... and {count - self.SCAN_ITEMS_PER_TYPE} more {elem_type}s")
         
         # Show other element types
-        other_types = [t for t in by_type.keys() 
-                      if t not in ['input', 'textarea', 'button', 'link']]
-        if other_types:
+        other = [(t, n) for t, n in counts.items() if t not in self._PRIORITY_TYPES]
+        if other:
             lines.append(f"\n OTHER ELEMENTS:")
-            for t in other_types:
-                count = len(by_type[t])
-                lines.append(f"{count} {t}(s)")
+            lines.extend(f"{n} {t}(s)" for t, n in other)
 
         lines.append(" Use these element IDs with: click N, type N \"text\", hover N, etc.")
         
@@ -560,111 +907,361 @@ class LLMBrowserAgent:
             parts.append("Page context unavailable")
         
         if self.browser.element_map:
-            type_counts = {}
-            for meta in self.browser.element_map.values():
-                elem_type = meta.get('type', 'unknown').lower()
-                type_counts[elem_type] = type_counts.get(elem_type, 0) + 1
-            
-            elem_summary = ', '.join(f"{count} {typ}" for typ, count in sorted(type_counts.items()))
+            type_counts = self.browser.element_map.type_counts
+            elem_summary = ', '.join(
+                f"{count} {typ.lower()}" for typ, count in sorted(type_counts.items())
+            )
             parts.append(f"Scanned: {elem_summary}")
         else:
             parts.append("No elements scanned yet")
         
         return " | ".join(parts)
     
-    def _call_llm(self, user_message: str) -> str:
+    def _call_llm(
+        self,
+        user_message: str,
+        max_tokens: Optional[int] = None,
+        model_override: Optional[str] = None
+    ) -> str:
         """Call LLM with managed conversation history."""
-        self.api_calls_made += 1
+        self._remember_user(user_message)
         
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        # Messages are truncated on insertion; the deque bounds how many are kept
+        assistant_message = self._complete(
+            list(self.conversation_history),
+            max_tokens,
+            model_override or self.active_model
+        )
         
-        # Truncate old messages AGGRESSIVELY to keep context small
-        history = []
-        for msg in self.conversation_history[-self.MAX_CONVERSATION_MESSAGES:]:
-            content = msg["content"]
-            
-            # Very aggressive truncation
-            if msg["role"] == "assistant":
-                # Assistant messages are usually short, keep them at 150
-                if len(content) > 150:
-                    content = content[:150] + "..."
-            else:
-                # User messages (feedback) - truncate heavily
-                if len(content) > 500:
-                    content = content[:500] + "...[msg truncated]"
-            
-            history.append({
-                "role": msg["role"],
-                "content": content
-            })
+        self._remember_assistant(assistant_message)
+        return assistant_message
+    
+    def _complete(self, history: List[Dict[str, str]], max_tokens: Optional[int], model: str) -> str:
+        """
+        One completion over the system prompt plus history.
+        Leaves conversation_history alone, so it can also run speculatively.
+        """
+        messages = [*self._system_messages, *history]
         
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            *history
-        ]
+        # Identical prompt + history => identical response at low temperature
+        cache_key = None
+        if self.response_cache is not None:
+            # Content-addressed over everything the model sees, so a hit can
+            # only come from an identical request
+            cache_key = ResponseCache.make_key({"model": model, "messages": messages})
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        
+        self.api_calls_made += 1
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            request = dict(
+                model=model,
                 messages=messages,
-                temperature=0,
-                max_tokens=150  # Increased from 50 to give room for THINKING + ACTION
+                temperature=self.TEMPERATURE,
+                max_tokens=max_tokens or self.DEFAULT_MAX_TOKENS
             )
+            if self.stream:
+                assistant_message = self._stream_completion(request)
+            else:
+                try:
+                    response = self.client.chat.completions.create(
+                        **request, **self._response_format_kwargs()
+                    )
+                except Exception as e:
+                    if 'json_validate_failed' not in str(e):
+                        raise
+                    # Model emitted non-JSON; accept plain text (parsed by the fallback)
+                    response = self.client.chat.completions.create(**request)
+                
+                assistant_message = response.choices[0].message.content.strip()
             
-            assistant_message = response.choices[0].message.content.strip()
-            
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
+            # Never replay a malformed response
+            if cache_key is not None and self._parse_response(assistant_message).error is None:
+                self.response_cache.put(cache_key, assistant_message)
             
             return assistant_message
         
         except Exception as e:
             raise RuntimeError(f"LLM API call failed: {str(e)}")
     
+    def _stream_completion(self, request: Dict[str, Any]) -> str:
+        """
+        Stream a completion and stop reading once the reply holds a decision.
+        JSON mode isn't combined with streaming; the text fallback parses either form.
+        """
+        chunks: List[str] = []
+        stream = self.client.chat.completions.create(**request, stream=True)
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                chunks.append(delta)
+                # Only a closing brace or a newline can complete a decision
+                if ('}' in delta or '\n' in delta) and _reply_complete(''.join(chunks)):
+                    break
+        finally:
+            # Closing drops the connection, so the server stops generating
+            stream.close()
+        
+        return ''.join(chunks).strip()
+    
+    def _response_format_kwargs(self) -> Dict[str, Any]:
+        """Request JSON mode so replies parse with json.loads instead of line matching."""
+        if self.JSON_MODE:
+            return {"response_format": {"type": "json_object"}}
+        return {}
+    
+    def _shortcut_response(self, result: ExecutionResult, task: str) -> Optional[str]:
+        """
+        Return a synthesized reply when the next step is mechanical, else None.
+        
+        - Pure navigation task whose words all appear in the new page's
+          title/URL -> finish
+        - Fresh 'go' on a search task with nothing scanned yet -> scan inputs
+        """
+        if not result.success:
+            return None
+        
+        if self._page_matches_task(result, task):
+            tokens = _TASK_TOKEN_RE.findall(task.lower())
+            if _NAV_TASK_RE.match(task.strip()) and _TASK_ACTION_WORDS.isdisjoint(tokens):
+                return json.dumps({
+                    "thinking": "Page title and URL match every part of the task.",
+                    "finish": f"Reached {result.page_title}"
+                })
+        
+        first = result.command.split(None, 1)[0].lower()
+        if first == 'go' and 'search' in task.lower() and not self.browser.element_map:
+            return json.dumps({
+                "thinking": "New page loaded; find the search box.",
+                "action": "scan inputs"
+            })
+        
+        return None
+    
+    @staticmethod
+    def _page_matches_task(result: ExecutionResult, task: str) -> bool:
+        """True if the command changed the page and every significant task word is a word of its title/URL."""
+        if not (result.page_changed and result.page_title and result.page_url):
+            return False
+        page_words = set(_TASK_TOKEN_RE.findall(f"{result.page_title} {result.page_url}".lower()))
+        words = {
+            w for w in _TASK_TOKEN_RE.findall(task.lower())
+            if w not in _TASK_STOPWORDS and (len(w) >= 3 or w.isdigit())
+        }
+        return bool(words) and words <= page_words
+    
+    def _semantic_state(self, result: ExecutionResult) -> str:
+        """
+        Describe the decision point for the semantic cache: task, page location
+        (query/fragment stripped), element-type histogram and the last command.
+        """
+        url = result.page_url or self.browser.page.url
+        parsed_url = urlparse(url)
+        
+        histogram = self.browser.element_map.type_counts
+        elements = ' '.join(f"{t}:{n}" for t, n in sorted(histogram.items()))
+        
+        last = result.command.split(None, 1)[0].lower()
+        outcome = "ok" if result.success else "failed"
+        
+        return (
+            f"task: {self.original_task}\n"
+            f"page: {parsed_url.netloc}{parsed_url.path}\n"
+            f"elements: {elements or 'none'}\n"
+            f"last: {last} {outcome}"
+        )
+    
+    def _initial_response(self, task: str, initial_prompt: str) -> str:
+        """
+        First decision for a task. With the semantic cache on, a task seen
+        before on the same page (across runs) reuses its first action.
+        """
+        if self.semantic_cache is None:
+            return self._call_llm(initial_prompt, self.STEP_MAX_TOKENS)
+        
+        parsed_url = urlparse(self.browser.page.url)
+        key = (
+            f"model: {self.active_model}\n"
+            f"task: {task}\n"
+            f"page: {parsed_url.netloc}{parsed_url.path}\n"
+            f"first action"
+        )
+        cached = self.semantic_cache.get(key)
+        if cached is not None:
+            self.shortcut_hits += 1
+            self._remember_user(initial_prompt)
+            self._remember_assistant(cached)
+            return cached
+        
+        response = self._call_llm(initial_prompt, self.STEP_MAX_TOKENS)
+        parsed = self._parse_response(response)
+        if parsed.error is None and not parsed.done:
+            self.semantic_cache.put(key, response)
+        return response
+    
+    def _update_model_tier(self, command: Optional[str], success: bool):
+        """
+        Drop to the fast model after a run of trivial successful steps.
+        Any failure, parse error (command=None), or non-trivial step promotes back.
+        """
+        if not self.auto_tier:
+            return
+        
+        first = command.split(None, 1)[0].lower() if command else ""
+        if success and first in self.TRIVIAL_COMMANDS:
+            self._trivial_streak += 1
+            if self._trivial_streak >= self.AUTO_DOWNGRADE_AFTER:
+                self.active_model = self.fast_model
+        else:
+            self._trivial_streak = 0
+            self.active_model = self.model
+    
+    def _submit_llm(
+        self,
+        user_message: str,
+        max_tokens: Optional[int] = None,
+        model_override: Optional[str] = None
+    ) -> Future:
+        """
+        Record user_message and start the completion on the shared LLM executor.
+        The worker only returns the reply; the caller records it once result()
+        succeeds, so a reply abandoned by Ctrl-C never lands in a later history.
+        """
+        self._remember_user(user_message)
+        return _LLM_EXECUTOR.submit(
+            self._complete,
+            list(self.conversation_history),
+            max_tokens,
+            model_override or self.active_model
+        )
+    
+    _NAVIGATION_COMMANDS = frozenset({'go', 'back', 'forward'})
+    
+    def _decision_model(self, result: ExecutionResult) -> Optional[str]:
+        """
+        Pick the fast model when the next decision is mechanical:
+        a navigation just landed on a new page, or a scan came back empty.
+        Returns None to use the active model.
+        """
+        if not self.auto_tier or not result.success:
+            return None
+        
+        cmd = result.command.split(' ', 1)[0].lower()
+        if result.page_changed and cmd in self._NAVIGATION_COMMANDS:
+            return self.fast_model
+        if cmd == 'scan' and "No interactive elements" in result.output:
+            return self.fast_model
+        return None
+    
+    # Commands whose success output is fixed and which don't navigate, so the
+    # next prompt can be predicted before they run
+    _SPECULATIVE_COMMANDS = frozenset({'type', 'hover', 'check', 'uncheck', 'select'})
+    
+    def _speculate(self, command: str, task: str, max_steps: int) -> Optional[Tuple[str, int, str, Future]]:
+        """
+        Start the next LLM call before the command runs, assuming it succeeds
+        without changing the page. Returns (feedback, max_tokens, model, future),
+        or None when the outcome isn't predictable.
+        """
+        if not self.SPECULATE:
+            return None
+        cmd = command.split(' ', 1)[0].lower()
+        if cmd not in self._SPECULATIVE_COMMANDS:
+            return None
+        
+        predicted = ExecutionResult(
+            success=True,
+            output=f"Command '{cmd}' executed successfully",
+            command=command
+        )
+        feedback = self._build_feedback(predicted, task)
+        
+        # Mirror what the real call would use after a success: failures reset,
+        # a non-trivial step promotes the tier back to the main model
+        max_tokens = self.EXTENDED_MAX_TOKENS if self.step_count >= max_steps - 3 else self.STEP_MAX_TOKENS
+        model = self.model if self.auto_tier else self.active_model
+        
+        history = deque(self.conversation_history, maxlen=self.MAX_CONVERSATION_MESSAGES)
+        history.append(self._user_entry(feedback))
+        future = _LLM_EXECUTOR.submit(self._complete, list(history), max_tokens, model)
+        return feedback, max_tokens, model, future
+    
+    def _adopt_speculation(
+        self,
+        speculation: Optional[Tuple[str, int, str, Future]],
+        feedback: str,
+        max_tokens: int,
+        model: str
+    ) -> Optional[Future]:
+        """
+        Return the speculative future if it asked exactly what the real call
+        would ask (recording the feedback in history), else None.
+        A mismatched speculation is left to finish and ignored.
+        """
+        if speculation is None or speculation[:3] != (feedback, max_tokens, model):
+            return None
+        
+        self.speculation_hits += 1
+        self._remember_user(feedback)
+        return speculation[3]
+    
+    def _step_max_tokens(self, max_steps: int) -> int:
+        """Give more room when recovering from failures or near the step limit."""
+        if self.consecutive_failures > 0 or self.step_count >= max_steps - 3:
+            return self.EXTENDED_MAX_TOKENS
+        return self.STEP_MAX_TOKENS
+    
     def _build_feedback(self, result: ExecutionResult, task: str) -> str:
         """Build minimal feedback message for LLM."""
+        cmd = result.command.split(' ', 1)[0]
+        
         if result.success:
             output = result.output
             
             # Truncate aggressively
-            if result.command.startswith('read_page'):
+            if cmd == 'read_page':
                 if len(output) > 500:
                     output = output[:500] + "\n\n...[truncated for token limit]"
             elif len(output) > 350:
                 output = output[:350] + "..."
             
-            feedback = f"SUCCESS: {output}"
+            sections = [f"SUCCESS: {output}"]
             
             # Detect stuck scan loops
-            if result.command.startswith('scan') and "No interactive elements" in output:
+            if cmd == 'scan' and "No interactive elements" in output:
                 if hasattr(self, 'consecutive_scan_failures'):
                     self.consecutive_scan_failures += 1
                     if self.consecutive_scan_failures >= 2:
-                        feedback += "\n\nNo elements found after multiple scans. Try: read_page OR press keys directly"
+                        sections.append("No elements found after multiple scans. Try: read_page OR press keys directly")
                 else:
-                    feedback += "\n\nNo elements found. Try different approach"
+                    sections.append("No elements found. Try different approach")
             
             if result.page_changed and result.page_title:
-                feedback += f"\n\nPage changed: {result.page_title}"
+                sections.append(f"Page changed: {result.page_title}")
+                if self._page_matches_task(result, task):
+                    sections.append("HINT: Page title/URL matches the task words - check whether anything is left to do")
             
             # Hint for type commands
-            if result.command.startswith('type ') and not result.page_changed:
-                feedback += "\n\nHINT: Text entered. Press Enter to submit"
+            if cmd == 'type' and not result.page_changed:
+                sections.append("HINT: Text entered. Press Enter to submit")
             
             # CHANGED: Only ask about completion, don't prompt it every time
-            feedback += f"\n\nTask objective: {task}"
-            feedback += "\nIs task objective fully achieved? If yes, use FINISH:"
+            sections.append(
+                f"Task objective: {task}\n"
+                "Is task objective fully achieved? If yes, reply with finish"
+            )
             
         else:
-            feedback = f"FAILED: {result.output}"
+            sections = [f"FAILED: {result.output}"]
             if self.consecutive_failures >= 2:
-                feedback += f"\n\nTry different approach"
+                sections.append("Try different approach")
         
+        feedback = "\n\n".join(sections)
         return feedback
         
     def execute_task(self, task: str, max_steps: int = None):
@@ -672,48 +1269,68 @@ class LLMBrowserAgent:
         if max_steps is None:
             max_steps = self.DEFAULT_MAX_STEPS
         
+        if self._degraded:
+            console.print("[red] No browser available - type 'reset' to relaunch[/red]\n")
+            return
+        
         console.print(f"[bold cyan] TASK: {task}[/bold cyan]")
+        
+        direct = _direct_command(task)
+        if direct is not None:
+            self._run_direct(direct)
+            return
+        
         console.print(f"[dim]Model: {self.model} | Max steps: {max_steps}[/dim]\n")
         
         self.step_count = 0
         self.original_task = task
+        self._trivial_streak = 0
+        self.active_model = self.model
+        self._last_feedback_hash: Optional[int] = None
+        self._feedback_repeats = 0
         
         # Get initial command
         try:
             initial_prompt = (
                 f" TASK: {task}\n\n"
                 f"Analyze this task and provide your FIRST action.\n"
-                f"Remember to respond with:\n"
-                f"THINKING: <your analysis>\n"
-                f"ACTION: <single command>"
+                f"Remember to respond with JSON:\n"
+                f'{{"thinking": "<your analysis>", "action": "<single command>"}}'
             )
-            llm_response = self._call_llm(initial_prompt)
+            llm_response = self._initial_response(task, initial_prompt)
         except Exception as e:
             console.print(f"[bold red] LLM Error:[/bold red] {e}")
             return
         
         # Main execution loop
         while self.step_count < max_steps:
+            # Ctrl-C checkpoint: stop between steps rather than mid-action
+            if self._interrupted:
+                _warn("\n Task interrupted\n")
+                return
+            
             self.step_count += 1
             
             # Parse LLM response
             parsed = self._parse_response(llm_response)
             
             # Handle parse errors
-            if 'error' in parsed:
-                console.print(f"[red]ï¸  Parse Error:[/red] {parsed['error']}")
+            if parsed.error is not None:
+                console.print(f"[red]ï¸  Parse Error:[/red] {parsed.error}")
                 console.print(f"[dim]Raw response: {llm_response[:200]}...[/dim]\n")
+                self._last_feedback_hash = None
+                self._update_model_tier(None, False)
                 
                 try:
                     llm_response = self._call_llm(
-                        f" Your response format was invalid: {parsed['error']}\n\n"
-                        "Please respond using the EXACT format:\n\n"
-                        "THINKING: <one sentence>\n"
-                        "ACTION: <single command>\n\n"
+                        f" Your response format was invalid: {parsed.error}\n\n"
+                        "Please respond with EXACTLY one JSON object:\n\n"
+                        '{"thinking": "<one sentence>", "action": "<single command>"}\n\n'
                         "OR if task is complete:\n\n"
-                        "THINKING: <what you accomplished>\n"
-                        "FINISH: <summary>\n\n"
-                        "DO NOT write 'ACTION: DONE' - use 'FINISH:' instead!"
+                        '{"thinking": "<what you accomplished>", "finish": "<summary>"}\n\n'
+                        'DO NOT use "action": "DONE" - use "finish" instead!\n\n'
+                        f"{FORMAT_EXAMPLE}",
+                        self.EXTENDED_MAX_TOKENS
                     )
                 except Exception as e:
                     console.print(f"[red] LLM Error:[/red] {e}")
@@ -721,66 +1338,131 @@ class LLMBrowserAgent:
                 continue
             
             # Check if task is complete
-            if parsed.get('done'):
-                thinking = parsed.get('thinking', 'No analysis provided')
-                finish_msg = parsed.get('finish_message', 'Task completed')
-                
-                console.print(f"[bold green] TASK COMPLETED[/bold green]")
+            if parsed.done:
+                thinking = parsed.thinking
+                finish_msg = parsed.finish_message
                 
+                out = [f"[bold green] TASK COMPLETED[/bold green]"]
                 if thinking:
-                    console.print(f"\n[white] Analysis: {thinking}[/white]")
-                console.print(f"[white] Result: {finish_msg}[/white]\n")
+                    out.append(f"\n[white] Analysis: {thinking}[/white]")
+                out.append(f"[white] Result: {finish_msg}[/white]\n")
                 
-                console.print(f"[bold cyan] Summary:[/bold cyan]")
-                console.print(f"Steps taken: {self.step_count}")
-                console.print(f"API calls: {self.api_calls_made}")
+                out.append(f"[bold cyan] Summary:[/bold cyan]")
+                out.append(f"Steps taken: {self.step_count}")
+                out.append(f"API calls: {self.api_calls_made}")
+                if self.cache_hits:
+                    out.append(f"Cache hits: {self.cache_hits}")
+                if self.shortcut_hits:
+                    out.append(f"Skipped LLM calls: {self.shortcut_hits}")
+                if self.speculation_hits:
+                    out.append(f"Speculative calls used: {self.speculation_hits}")
                 
                 title, url = self._get_page_context()
                 if title and url:
-                    console.print(f"Final page: {title}")
-                    console.print(f"Final URL: {url}")
+                    out.append(f"Final page: {title}")
+                    out.append(f"Final URL: {url}")
                 
-                console.print()
+                out.append("")
+                console.print("\n".join(out))
                 return
             
             # Execute command
-            command = parsed['command']
-            thinking = parsed.get('thinking', 'No analysis provided')
+            command = parsed.command
+            thinking = parsed.thinking
             
-            console.print(f"[bold yellow]Step {self.step_count}[/bold yellow]")
+            # One write per block: header before executing, results after
+            out = [f"[bold yellow]Step {self.step_count}[/bold yellow]"]
             if thinking:
-                console.print(f"[dim] {thinking}[/dim]")
-            console.print(f"[cyan] ACTION: {command}[/cyan]")
+                out.append(f"[dim] {thinking}[/dim]")
+            out.append(f"[cyan] ACTION: {command}[/cyan]")
+            console.print("\n".join(out))
             
+            # The next call may already be in flight while the command runs
+            speculation = self._speculate(command, task, max_steps)
             result = self._execute_command(command)
             
-            # Display result
             if result.success:
-                console.print(f"[green] SUCCESS[/green]")
                 self.consecutive_failures = 0
             else:
-                console.print(f"[red] FAILED[/red]")
                 self.consecutive_failures += 1
             
+            self._update_model_tier(command, result.success)
+            
+            # Build feedback and start the next LLM call right away so the
+            # round-trip overlaps with displaying this step's output
+            feedback = self._build_feedback(result, task)
+            shortcut = self._shortcut_response(result, task)
+            
+            # Same command and same feedback as last step: the model already
+            # answered exactly this state (with this step's action), so replay
+            # that reply and stop if it keeps repeating. The command is part of
+            # the key because success feedback doesn't carry the arguments:
+            # "type 1 alice" then "type 2 secret" must not count as a repeat.
+            feedback_hash = hash((result.command, feedback))
+            stuck = False
+            if shortcut is None and feedback_hash == self._last_feedback_hash:
+                self._feedback_repeats += 1
+                stuck = self._feedback_repeats >= self.MAX_FEEDBACK_REPEATS
+                shortcut = llm_response
+            else:
+                self._feedback_repeats = 0
+            self._last_feedback_hash = feedback_hash
+            
+            semantic_key = None
+            if shortcut is None and self.semantic_cache is not None:
+                semantic_key = self._semantic_state(result)
+                shortcut = self.semantic_cache.get(semantic_key)
+            if shortcut is None:
+                max_tokens = self._step_max_tokens(max_steps)
+                model = self._decision_model(result) or self.active_model
+                llm_future = self._adopt_speculation(speculation, feedback, max_tokens, model)
+                if llm_future is None:
+                    llm_future = self._submit_llm(feedback, max_tokens, model)
+            else:
+                # Keep the exchange in history as if the model had answered
+                self.shortcut_hits += 1
+                self._remember_user(feedback)
+                self._remember_assistant(shortcut)
+                llm_future = None
+            
+            # Display result
+            out = [f"[green] SUCCESS[/green]" if result.success else f"[red] FAILED[/red]"]
+            
             # Show output (truncated for display)
             output_lines = result.output.split('\n')
-            for line in output_lines[:12]:
-                if line.strip():
-                    console.print(f"  {line}")
+            out.extend(f"  {line}" for line in output_lines[:12] if line.strip())
             if len(output_lines) > 12:
-                console.print(f"[dim]  ... ({len(output_lines) - 12} more lines)[/dim]")
+                out.append(f"[dim]  ... ({len(output_lines) - 12} more lines)[/dim]")
             
-            console.print()
+            out.append("")
+            console.print("\n".join(out))
             
-            # Build feedback for next iteration
-            feedback = self._build_feedback(result, task)
+            if stuck:
+                _warn(" Stuck: the same result keeps repeating - stopping task\n")
+                return
+            
+            # Warm the page context while the LLM call is in flight, so a
+            # finish reply prints its summary without another browser round-trip
+            if llm_future is not None and not llm_future.done():
+                self._get_page_context()
             
             # Get next command
+            if llm_future is None:
+                llm_response = shortcut
+                continue
+            
             try:
-                llm_response = self._call_llm(feedback)
+                llm_response = llm_future.result()
             except Exception as e:
                 console.print(f"[red] LLM Error:[/red] {e}")
                 break
+            self._remember_assistant(llm_response)  # Only now: the future was ours to the end
+            
+            # Only actions are reusable; a finish summary is specific to this run
+            if semantic_key is not None:
+                parsed_next = self._parse_response(llm_response)
+                if parsed_next.error is None and not parsed_next.done:
+                    self.semantic_cache.put(semantic_key, llm_response)
         
         # Max steps reached
         if self.step_count >= max_steps:
@@ -788,54 +1470,132 @@ class LLMBrowserAgent:
             console.print(f"\n[dim] Final state: {self._build_context_summary()}[/dim]")
             console.print(f"[dim] API calls made: {self.api_calls_made}[/dim]\n")
     
+    def _run_direct(self, command: str):
+        """Run a task that maps straight to one command, skipping the LLM."""
+        self.browser.log_action("direct_dispatch", command)
+        console.print(f"[cyan] ACTION: {command}[/cyan] [dim](no LLM call)[/dim]")
+        result = self._execute_command(command)
+        
+        out = [f"[green] SUCCESS[/green]" if result.success else f"[red] FAILED[/red]"]
+        output_lines = result.output.split('\n')
+        out.extend(f"  {line}" for line in output_lines[:12] if line.strip())
+        if len(output_lines) > 12:
+            out.append(f"[dim]  ... ({len(output_lines) - 12} more lines)[/dim]")
+        out.append("")
+        console.print("\n".join(out))
+    
+    def execute_tasks_batch(self, tasks: List[str], max_steps: int = None):
+        """
+        Run several tasks back to back in one conversation.
+        Per-task counters reset; history carries over so related tasks share context.
+        """
+        self._reset_conversation()
+        for task in tasks:
+            if self._interrupted:
+                break
+            self.api_calls_made = 0
+            self.cache_hits = 0
+            self.shortcut_hits = 0
+            self.speculation_hits = 0
+            self.consecutive_failures = 0
+            self.execute_task(task, max_steps)
+    
+    _EXIT_INPUTS = frozenset({'quit', 'exit', 'q'})
+    _CONTROL_INPUTS = _EXIT_INPUTS | {'reset'}
+    
+    @staticmethod
+    def _drain_pending_input() -> List[str]:
+        """Read task lines already waiting on stdin (e.g. a pasted list) without blocking."""
+        lines = []
+        try:
+            while select.select([sys.stdin], [], [], 0)[0]:
+                line = sys.stdin.readline()
+                if not line:
+                    break
+                if line.strip():
+                    lines.append(line.strip())
+        except (OSError, ValueError):
+            # select() on stdin is unsupported on Windows consoles/pipes
+            pass
+        return lines
+    
+    @contextmanager
+    def _sigint_as_flag(self):
+        """
+        While active, Ctrl-C sets self._interrupted (polled between steps)
+        instead of raising. A second Ctrl-C raises KeyboardInterrupt as usual.
+        """
+        self._interrupted = False
+        if threading.current_thread() is not threading.main_thread():
+            yield  # Signal handlers can only be installed from the main thread
+            return
+        
+        def on_sigint(signum, frame):
+            if self._interrupted:
+                raise KeyboardInterrupt
+            self._interrupted = True
+        
+        previous = signal.signal(signal.SIGINT, on_sigint)
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGINT, previous)
+    
     def interactive_mode(self):
         """Interactive mode for continuous task execution."""
-        console.print("[bold green]     INTELLIGENT BROWSER AGENT v2.0      [/bold green]")
+        console.print(f"[bold green]     INTELLIGENT BROWSER AGENT v{__version__}      [/bold green]")
         console.print(f"[dim]Model: {self.model}[/dim]")
         console.print(f"[dim]Mode: Single-step execution with full observability[/dim]")
         console.print(f"[dim]Commands: 'quit' to exit | 'reset' to restart browser[/dim]\n")
         
+        read_task = make_reader(
+            lambda: console.input("[bold blue] Task> [/bold blue]"),
+            " Task> ", "bold ansiblue", history="task_history"
+        )
+        
         try:
             while True:
-                try:
-                    task = console.input("[bold blue] Task> [/bold blue]").strip()
-                except EOFError:
-                    break
+                if self._task_queue:
+                    task = self._task_queue.popleft()
+                else:
+                    try:
+                        # A bracketed paste can hold several lines: queue the rest
+                        lines = [line.strip() for line in read_task().splitlines()]
+                    except EOFError:
+                        break
+                    task = lines[0] if lines else ''
+                    self._task_queue.extend(line for line in lines[1:] if line)
                 
                 if not task:
                     continue
                 
-                if task.lower() in ['quit', 'exit', 'q']:
+                if task.lower() in self._EXIT_INPUTS:
                     console.print("[dim] Shutting down...[/dim]")
                     break
                 
                 if task.lower() == 'reset':
                     console.print("[yellow] Resetting browser...[/yellow]")
-                    try:
-                        if self._owns_browser:
-                            self.browser.close()
-                        self.browser = BrowserAgent(headless=False)
-                        self.commands = build_command_registry(self.browser)
-                        self._owns_browser = True
+                    if self._reset_browser():
                         console.print("[green] Browser reset complete[/green]\n")
-                    except Exception as e:
-                        console.print(f"[red] Reset failed: {e}[/red]\n")
                     continue
                 
-                # Reset conversation state for new task
-                self.conversation_history = []
-                self.api_calls_made = 0
-                self.consecutive_failures = 0
+                # Lines pasted together run as one batch, up to the next control command
+                self._task_queue.extend(self._drain_pending_input())
+                batch = [task]
+                while self._task_queue and self._task_queue[0].lower() not in self._CONTROL_INPUTS:
+                    batch.append(self._task_queue.popleft())
                 
                 try:
-                    self.execute_task(task)
+                    with self._sigint_as_flag():
+                        self.execute_tasks_batch(batch)
                 except KeyboardInterrupt:
-                    console.print("\n[yellow]ï¸  Task interrupted[/yellow]\n")
+                    # Second Ctrl-C while a step was blocked
+                    _warn("\n Task interrupted\n")
                 except Exception as e:
-                    console.print(f"[red] Task execution error: {e}[/red]\n")
-                    if os.getenv("DEBUG"):
+                    _err(f" Task execution error: {e}\n")
+                    if _DEBUG:
                         import traceback
-                        console.print(f"[dim]{traceback.format_exc()}[/dim]\n")
+                        sys.stderr.write(traceback.format_exc())
         
         except KeyboardInterrupt:
             console.print("\n[dim] Interrupted[/dim]")
@@ -845,11 +1605,70 @@ class LLMBrowserAgent:
     
     def close(self):
         """Clean up resources."""
-        if self._owns_browser and hasattr(self, 'browser'):
+        for cache in (self.response_cache, self.semantic_cache):
+            if cache is None:
+                continue
             try:
-                self.browser.close()
-            except Exception:
-                pass
+                cache.save()
+            except OSError as e:
+                console.print(f"[yellow]Could not save response cache: {e}[/yellow]")
+        
+        if self._owns_browser and self.browser is not None:
+            self._safe_close()
+    
+    def _adopt_browser(self, browser, owned: bool):
+        """
+        Make `browser` the agent's browser. Owned browsers get a finalizer, so
+        they are closed exactly once: by close(), on collection, or at exit.
+        """
+        self.browser = browser
+        self._owns_browser = owned
+        self._finalizer = weakref.finalize(self, _close_browser, browser) if owned else None
+    
+    def _safe_close(self) -> bool:
+        """Close the owned browser, never raising. Returns True if it closed cleanly."""
+        finalizer, self._finalizer = self._finalizer, None
+        self.browser = None
+        if finalizer is None or not finalizer.alive:
+            return True
+        return finalizer()
+    
+    def _try_reset_context(self) -> bool:
+        """Recycle the owned browser's context in place. Returns False if it can't."""
+        if not self._owns_browser or self.browser is None or self._degraded:
+            return False
+        try:
+            self.browser.reset_session()
+            return True
+        except Exception as e:
+            console.print(f"[yellow] Context reset failed ({e}), relaunching browser[/yellow]")
+            return False
+    
+    def _reset_browser(self) -> bool:
+        """
+        Reset the browser in ordered steps:
+        1. recycle the context (keeps Chromium running)
+        2. otherwise close and relaunch
+        A failed relaunch leaves the agent degraded (no browser) until the next reset.
+        """
+        if not self._try_reset_context():
+            self._safe_close()
+            try:
+                browser = _BrowserAgent(headless=False)
+            except Exception as e:
+                self._owns_browser = False
+                self._degraded = True
+                console.print(f"[red] Reset failed: {e}[/red]\n")
+                return False
+            
+            self._adopt_browser(browser, owned=True)
+            self._degraded = False
+            self._set_commands(_registry_for(self.browser))
+        
+        # A recycled context keeps the same browser object, so the installed
+        # registry (and its precomputed lookups) is still valid
+        self._context_cache = None
+        return True
     
     def __enter__(self):
         return self
@@ -859,8 +1678,59 @@ class LLMBrowserAgent:
         return False
 
 
-def main():
-    """Main entry point with CLI argument parsing."""
+__version__ = "2.0"
+
+# Printed for a bare -h/--help without building the parser; keep in sync with _build_parser_for('run')
+_STATIC_HELP = """\
+usage: agent.py [-h] [--version] [--headless] [--model MODEL]
+                [--tier {balanced,fast70b,instant}] [--api-key API_KEY]
+                [--max-steps MAX_STEPS] [--cache | --no-cache] [--stream]
+                [--semantic-cache]
+
+Intelligent Single-Step Browser Agent
+
+options:
+  -h, --help            show this help message and exit
+  --version             show program's version number and exit
+  --headless            Run browser in headless mode (no GUI)
+  --model MODEL         LLM model to use; overrides --tier and disables auto-
+                        tiering (or set GROQ_MODEL env var)
+  --tier {balanced,fast70b,instant}
+                        Model speed tier (default: balanced)
+  --api-key API_KEY     Groq API key (or set GROQ_API_KEY env var)
+  --max-steps MAX_STEPS
+                        Maximum steps per task (default: 25)
+  --cache, --no-cache   Cache LLM responses for identical requests; --no-cache
+                        for benchmarking (default: on)
+  --stream              Stream replies and stop reading once the action
+                        arrives
+  --semantic-cache      Reuse responses for near-identical page states (needs
+                        numpy + sentence-transformers)
+
+Examples:
+  agent.py --headless                    # Run in headless mode
+  agent.py --model meta-llama/llama-guard-4-12b  # Use larger model
+  agent.py --tier fast70b                # Speculative-decoding 70B model
+  agent.py --max-steps 50                # Allow more steps"""
+
+
+# CLI subcommands; the first one is the default when none is given
+_SUBCOMMANDS = ('run',)
+
+
+def _sniff_subcommand(argv: List[str]) -> Tuple[str, List[str]]:
+    """Pick the subcommand from argv without building a parser; returns (name, rest)."""
+    for i, arg in enumerate(argv):
+        if arg.startswith('-'):
+            continue
+        if arg in _SUBCOMMANDS:
+            return arg, argv[:i] + argv[i + 1:]
+        break
+    return _SUBCOMMANDS[0], argv
+
+
+def _build_parser_for(subcommand: str):
+    """Build a parser holding only the arguments the subcommand uses."""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -870,10 +1740,27 @@ def main():
 Examples:
   %(prog)s --headless                    # Run in headless mode
   %(prog)s --model meta-llama/llama-guard-4-12b  # Use larger model
+  %(prog)s --tier fast70b                # Speculative-decoding 70B model
   %(prog)s --max-steps 50                # Allow more steps
         """
     )
     
+    parser.add_argument(
+        '--version',
+        action='version',
+        version=f'%(prog)s {__version__}'
+    )
+    
+    if subcommand == 'run':
+        _add_run_arguments(parser)
+    
+    return parser
+
+
+def _add_run_arguments(parser):
+    """Arguments for 'run' (interactive agent session)."""
+    from argparse import BooleanOptionalAction
+    
     parser.add_argument(
         '--headless',
         action='store_true',
@@ -883,8 +1770,15 @@ Examples:
     parser.add_argument(
         '--model',
         type=str,
-        default=os.getenv('GROQ_MODEL', LLMBrowserAgent.DEFAULT_MODEL),
-        help=f'LLM model to use (default: {LLMBrowserAgent.DEFAULT_MODEL})'
+        default=None,
+        help='LLM model to use; overrides --tier and disables auto-tiering (or set GROQ_MODEL env var)'
+    )
+    
+    parser.add_argument(
+        '--tier',
+        choices=sorted(LLMBrowserAgent.SPEED_MAP),
+        default=LLMBrowserAgent.DEFAULT_TIER,
+        help='Model speed tier (default: %(default)s)'
     )
     
     parser.add_argument(
@@ -896,20 +1790,47 @@ Examples:
     parser.add_argument(
         '--max-steps',
         type=int,
-        default=25,
-        help='Maximum steps per task (default: 25)'
+        default=LLMBrowserAgent.DEFAULT_MAX_STEPS,
+        help='Maximum steps per task (default: %(default)s)'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--cache',
+        action=BooleanOptionalAction,
+        default=True,
+        help='Cache LLM responses for identical requests; --no-cache for benchmarking (default: on)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream replies and stop reading once the action arrives'
+    )
     
+    parser.add_argument(
+        '--semantic-cache',
+        action='store_true',
+        help='Reuse responses for near-identical page states (needs numpy + sentence-transformers)'
+    )
+
+
+def _run(args):
+    """Start an interactive agent session."""
     try:
-        with LLMBrowserAgent(
+        agent = LLMBrowserAgent(
             api_key=args.api_key,
             headless=args.headless,
-            model=args.model
-        ) as agent:
-            agent.DEFAULT_MAX_STEPS = args.max_steps
-            agent.interactive_mode()
+            model=args.model,
+            use_cache=args.cache,
+            tier=args.tier,
+            semantic_cache=args.semantic_cache,
+            stream=args.stream
+        )
+        agent.DEFAULT_MAX_STEPS = args.max_steps
+        # interactive_mode closes the agent on the way out. On the sys.exit
+        # paths below the browser finalizer closes Chromium at interpreter
+        # exit, after the message has been printed.
+        agent.interactive_mode()
     
     except KeyboardInterrupt:
         console.print("\n[dim] Interrupted[/dim]")
@@ -921,12 +1842,26 @@ Examples:
         sys.exit(1)
     
     except Exception as e:
-        console.print(f"[bold red] Fatal Error:[/bold red] {e}")
-        if os.getenv("DEBUG"):
+        _err(f" Fatal Error: {e}")
+        if _DEBUG:
             import traceback
-            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            sys.stderr.write(traceback.format_exc())
         sys.exit(1)
 
 
+def main():
+    """Main entry point with CLI argument parsing."""
+    # Fast path: answer --help/--version without constructing the parser
+    if len(sys.argv) == 2 and sys.argv[1] in ('-h', '--help', '--version'):
+        print(f"agent.py {__version__}" if sys.argv[1] == '--version' else _STATIC_HELP)
+        sys.exit(0)
+    
+    subcommand, argv = _sniff_subcommand(sys.argv[1:])
+    args = _build_parser_for(subcommand).parse_args(argv)
+    
+    if subcommand == 'run':
+        _run(args)
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
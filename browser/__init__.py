@@ -4,6 +4,7 @@ Exports base agent, mixins, and utilities.
 """
 
 from .base_agent import BaseBrowserAgent, console
+from .element_map import ElementMap
 from .navigation import NavigationMixin
 from .interaction import InteractionMixin
 from .scanning import ScanningMixin
@@ -13,5 +14,6 @@ __all__ = [
     'NavigationMixin',
     'InteractionMixin',
     'ScanningMixin',
+    'ElementMap',
     'console'
 ]
\ No newline at end of file
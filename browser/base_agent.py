@@ -7,37 +7,168 @@ Key fixes:
 - Fixed timeout handling in cleanup
 """
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeout
 from rich.console import Console
 from rich.logging import RichHandler
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+from .element_map import ElementMap
+import atexit
 import logging
+import queue
+import re
 import shlex
 import sys
+import threading
+import time
 import os
 
-console = Console()
+# Playwright is imported when a browser is launched, not when the package loads
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Browser, BrowserContext
 
-def _setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
-    """Create a properly configured logger with Rich handler."""
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+# Piped/CI output has no colors to show: skip repr highlighting and let
+# long lines run on instead of hard-wrapping them. Markup is still parsed
+# so tags are stripped rather than printed.
+_STDOUT_TTY = sys.stdout.isatty()
+console = Console(highlight=_STDOUT_TTY, soft_wrap=not _STDOUT_TTY)
+
+# Visibility of several element handles in one round-trip (Playwright's "visible")
+VISIBILITY_SCRIPT = """
+    els => els.map(e => e.isConnected &&
+        getComputedStyle(e).visibility !== 'hidden' &&
+        !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length))
+"""
+
+# Live label match over the page's interactive elements, for labels the last
+# scan didn't index. Returns null when nothing matches.
+FIND_LABEL_SCRIPT = """
+    label => {
+        const visible = e => !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length);
+        for (const el of document.querySelectorAll('a, button, input, textarea, select, [role]')) {
+            const text = el.innerText || el.value || el.getAttribute('aria-label') ||
+                el.getAttribute('placeholder') || '';
+            if (text.trim().toLowerCase() === label && visible(el)) return el;
+        }
+        return null;
+    }
+"""
+
+# Selectors only Playwright's own engines understand (text=, xpath, >> chains,
+# Playwright-only pseudo-classes); never retried as a label
+_ENGINE_SELECTOR_RE = re.compile(
+    r'^\s*(?:[a-z_-]+=|//|\.\.|\()|>>'
+    r'|:(?:has-text|text|text-is|text-matches|visible|nth-match|right-of|left-of|above|below|near)\b'
+)
+
+# Element-kind checks installed once per context, so evaluate() calls send a
+# short lookup instead of re-shipping (and re-parsing) the function body.
+# Non-enumerable to stay out of the way of page scripts.
+ELEMENT_HELPERS_SCRIPT = """
+    Object.defineProperty(window, '__sis', {
+        value: Object.freeze({
+            isInput: e => e.tagName === 'INPUT' || e.tagName === 'TEXTAREA' ||
+                e.isContentEditable || e.getAttribute('role') === 'textbox',
+            isFillable: e => e.tagName === 'INPUT' || e.tagName === 'TEXTAREA' || e.isContentEditable,
+            isSelect: e => e.tagName === 'SELECT',
+        }),
+        enumerable: false,
+    });
+"""
+
+# Injected into every page before site scripts run
+ANTI_DETECTION_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
     
-    handler = RichHandler(
+    window.open = function(url) {
+        if (url) window.location.href = url;
+        return window;
+    };
+"""
+
+# One stderr handler shared by every logger below. Log messages carry no
+# markup, so off a terminal a plain stream handler does the same job
+# without Rich's per-record rendering. On a terminal markup stays off too:
+# nothing to parse, and bracketed command args print as written.
+if sys.stderr.isatty():
+    _shared_handler: logging.Handler = RichHandler(
         console=Console(stderr=True),
         show_path=False,
-        markup=True,
+        markup=False,
         show_time=False
     )
-    logger.addHandler(handler)
+else:
+    _shared_handler = logging.StreamHandler(sys.stderr)
+    _shared_handler.setFormatter(logging.Formatter("%(levelname)-8s %(message)s"))
+
+# Loggers only enqueue records; a listener thread does the Rich formatting
+# and stderr writes, so logging never blocks the command path
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_log_listener = QueueListener(_log_queue, _shared_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records
+
+def _setup_logger(name: str, level: int = logging.INFO,
+                  handler: logging.Handler = _queue_handler) -> logging.Logger:
+    """Configure a named logger on the shared queue handler."""
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    
+    if not logger.handlers:  # Re-imports must not stack duplicate handlers
+        logger.addHandler(handler)
     logger.propagate = False
     
     return logger
 
-command_logger = _setup_logger("commands", logging.INFO)
-action_logger = _setup_logger("actions", logging.INFO)
-error_logger = _setup_logger("errors", logging.ERROR)
+def _env_log_level(default: int = logging.INFO) -> int:
+    """Level from SISYPHUS_LOG_LEVEL (DEBUG, INFO, WARNING, ...), else default."""
+    level = logging.getLevelName(os.getenv("SISYPHUS_LOG_LEVEL", "").upper())
+    return level if isinstance(level, int) else default
+
+LOG_LEVEL = _env_log_level()
+
+command_logger = _setup_logger("commands", LOG_LEVEL)
+action_logger = _setup_logger("actions", LOG_LEVEL)
+error_logger = _setup_logger("errors", max(LOG_LEVEL, logging.ERROR))
+
+def format_ts_ns(ts_ns: int) -> str:
+    """Local HH:MM:SS of a command history entry's ts_ns (epoch nanoseconds)."""
+    return time.strftime("%H:%M:%S", time.localtime(ts_ns // 1_000_000_000))
+
+def _env_int(name: str, default: int) -> int:
+    """Integer from environment variable name, else default (with a warning if malformed)."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        action_logger.warning("Ignoring %s=%r (not an integer); using %d", name, value, default)
+        return default
+
+# Plain words and whole quoted words separated by whitespace (no escapes,
+# no quotes glued to other text) - the shape of nearly every command line
+_SIMPLE_LINE_RE = re.compile(r"""\s*(?:(?:"[^"\\]*"|'[^']*'|[^\s"'\\]+)(?:\s+|$))*""")
+_TOKEN_RE = re.compile(r""""([^"]*)"|'([^']*)'|(\S+)""")
+
+@lru_cache(maxsize=64)
+def _split_command(command_line: str) -> Tuple[str, ...]:
+    """
+    shlex.split, memoized; agents validate then execute the same line.
+    Unquoted lines are a plain str.split, simply quoted ones take a regex
+    fast path; anything else goes through shlex.
+    """
+    if '"' not in command_line and "'" not in command_line and '\\' not in command_line:
+        return tuple(command_line.split())
+    if _SIMPLE_LINE_RE.fullmatch(command_line):
+        return tuple(a or b or c for a, b, c in _TOKEN_RE.findall(command_line))
+    return tuple(shlex.split(command_line))
 
 def parse_command(command_line: str) -> Optional[List[str]]:
     """
@@ -48,13 +179,109 @@ def parse_command(command_line: str) -> Optional[List[str]]:
         return []
     
     try:
-        return shlex.split(command_line)
+        return list(_split_command(command_line))
     except ValueError as e:
         console.print(f"[bold red]Parse Error:[/bold red] {e}")
         console.print("[dim]Tip: Use quotes for text with spaces: type 1 'hello world'[/dim]")
         return None
 
 
+# ==================== Shared Browser Pool ====================
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+]
+# Ctrl-C belongs to the agent (stop at the next step, see _sigint_as_flag),
+# so Playwright must not close the browser on it; cleanup runs at exit
+LAUNCH_OPTIONS: Dict[str, Any] = {'args': LAUNCH_ARGS, 'handle_sigint': False}
+
+
+@dataclass
+class _SharedBrowser:
+    """One Playwright driver + Chromium, shared by the agents of one thread."""
+    key: Tuple[int, bool, Optional[str]]  # (thread id, headless, CDP endpoint)
+    playwright: Any
+    browser: "Browser"
+    refs: int = 0
+
+
+# The sync API is bound to the thread that started it, so browsers are shared
+# per thread (and headless mode), never across threads
+_BROWSER_POOL: Dict[Tuple[int, bool, Optional[str]], _SharedBrowser] = {}
+_BROWSER_POOL_LOCK = threading.Lock()
+
+
+def _acquire_browser(headless: bool, cdp_endpoint: Optional[str] = None) -> _SharedBrowser:
+    """
+    Reference this thread's shared browser, launching it on first use.
+    With cdp_endpoint, connects to an externally managed Chromium instead.
+    """
+    key = (threading.get_ident(), headless, cdp_endpoint)
+    with _BROWSER_POOL_LOCK:
+        shared = _BROWSER_POOL.get(key)
+        if shared is None or not shared.browser.is_connected():
+            # A dead entry is dropped here; its holders still release it
+            from playwright.sync_api import sync_playwright
+            
+            playwright = sync_playwright().start()
+            try:
+                if cdp_endpoint:
+                    browser = playwright.chromium.connect_over_cdp(cdp_endpoint)
+                else:
+                    browser = playwright.chromium.launch(headless=headless, **LAUNCH_OPTIONS)
+            except Exception:
+                playwright.stop()
+                raise
+            shared = _BROWSER_POOL[key] = _SharedBrowser(key, playwright, browser)
+        shared.refs += 1
+        return shared
+
+
+def _shutdown_browser(shared: _SharedBrowser) -> List[str]:
+    """
+    Close the browser and stop its driver. Returns error strings.
+    For a CDP connection close() only disconnects; the external browser keeps running.
+    """
+    errors = []
+    try:
+        shared.browser.close()
+    except Exception as e:
+        errors.append(f"browser: {e}")
+    try:
+        shared.playwright.stop()
+    except Exception as e:
+        errors.append(f"playwright: {e}")
+    return errors
+
+
+def _release_browser(shared: _SharedBrowser) -> List[str]:
+    """
+    Drop one reference. The main thread keeps an idle browser warm for the
+    next agent (closed at exit); other threads close it with the last reference.
+    """
+    with _BROWSER_POOL_LOCK:
+        shared.refs -= 1
+        if shared.refs > 0:
+            return []
+        if _BROWSER_POOL.get(shared.key) is shared:
+            if threading.current_thread() is threading.main_thread() and shared.browser.is_connected():
+                return []
+            del _BROWSER_POOL[shared.key]
+    return _shutdown_browser(shared)
+
+
+@atexit.register
+def _close_browser_pool():
+    """Close the browsers started on this (the main) thread."""
+    ident = threading.get_ident()
+    with _BROWSER_POOL_LOCK:
+        owned = [key for key in _BROWSER_POOL if key[0] == ident]
+        entries = [_BROWSER_POOL.pop(key) for key in owned]
+    for shared in entries:
+        _shutdown_browser(shared)
+
+
 class BaseBrowserAgent:
     """
     Core browser agent with Playwright integration.
@@ -68,58 +295,68 @@ class BaseBrowserAgent:
     
     DEFAULT_TIMEOUT = 30000  # 30 seconds
     CLEANUP_TIMEOUT = 5000   # 5 seconds for cleanup operations
+    # Oldest entries drop off in long sessions
+    MAX_COMMAND_HISTORY = _env_int("SISYPHUS_HISTORY_MAX", 10_000)
+    MAX_ELEMENTS = 2_000  # Scanned elements kept addressable; least recently seen go first
+    RECORD_HISTORY = os.getenv("SISYPHUS_NO_HISTORY") != "1"  # Off for scripted runs
+    # Fresh context every N actions (0 = never); Playwright's connection keeps
+    # per-context request/response objects alive for the context's lifetime
+    CONTEXT_ROTATE_EVERY = _env_int("SISYPHUS_CONTEXT_ROTATE", 500)
+    # Seconds an on-page lookup is reused; covers the back-to-back actions of
+    # one step (click, type, press) without trusting a handle for long
+    FIND_CACHE_TTL = 2.0
+    CONTEXT_OPTIONS: Dict[str, Any] = {
+        'viewport': {'width': 1920, 'height': 1080},
+        'locale': 'en-US',
+        'timezone_id': 'America/New_York',
+    }
     
-    def __init__(self, headless: bool = False, timeout: int = DEFAULT_TIMEOUT):
-        """Initialize browser with error handling."""
+    def __init__(self, headless: bool = False, timeout: int = DEFAULT_TIMEOUT,
+                 cdp_endpoint: Optional[str] = None, user_data_dir: Optional[str] = None,
+                 storage_state: Optional[str] = None):
+        """
+        Initialize browser with error handling.
+        
+        Args:
+            headless: Launch Chromium without a window
+            timeout: Default action timeout in ms
+            cdp_endpoint: Connect to a running Chromium (e.g. http://localhost:9222)
+                instead of launching one; its existing context is reused
+            user_data_dir: Profile directory for a persistent context, so cookies,
+                HTTP cache and service workers survive across runs
+            storage_state: JSON file of cookies/localStorage loaded into new
+                contexts (if it exists) and saved back on close
+        """
+        if user_data_dir and (cdp_endpoint or storage_state):
+            raise ValueError("user_data_dir cannot be combined with cdp_endpoint or storage_state")
+        
         self.timeout = timeout
+        self.cdp_endpoint = cdp_endpoint
+        self.user_data_dir = user_data_dir
+        self.storage_state = storage_state
         self.playwright = None
         self.browser = None
         self.context = None
+        self._shared: Optional[_SharedBrowser] = None
+        self._owns_context = True  # False for a CDP browser's own context
 
         self.page = None
         self._is_healthy = False
+        self._found: Dict[str, Tuple[float, Any]] = {}  # Selector -> (expiry, handle)
+        self._found_page = None  # Page the _found entries belong to
         
         self._navigation_stack: List[str] = []  # For NavigationMixin
         self._page_load_metrics: Dict[str, Any] = {}  # For NavigationMixin
         self._element_registry = {}  # For ScanningMixin (might already be in __init__)
         self._next_index = 1
         
+        # Chosen once here so the per-command path carries no history check
+        if not self.RECORD_HISTORY:
+            self.log_command = self._count_command
+        
         try:
-            self.playwright = sync_playwright().start()
-            
-            self.browser: Browser = self.playwright.chromium.launch(
-                headless=headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                ]
-            )
-            
-            self.context: BrowserContext = self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='America/New_York'
-            )
-            
-            self.page: Page = self.context.new_page()
-            self.page.set_default_timeout(timeout)
-            
-            # Anti-detection
-            self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                window.open = function(url) {
-                    if (url) window.location.href = url;
-                    return window;
-                };
-            """)
-            
-            # State
-            self.command_history: List[Dict[str, Any]] = []
-            self.action_count: int = 0
-            self.element_map: Dict[int, Dict[str, Any]] = {}
+            self._launch_playwright(headless)
+            self._new_session(reuse_context=bool(cdp_endpoint))
             
             self._is_healthy = True
             action_logger.info("Browser initialized")
@@ -129,6 +366,171 @@ class BaseBrowserAgent:
             self._cleanup()
             raise RuntimeError(f"Browser initialization failed: {e}")
     
+    # ==================== Session Lifecycle ====================
+    
+    def _launch_playwright(self, headless: bool):
+        """
+        Attach to this thread's shared Chromium, launching it only if none is
+        running (the expensive part). Each agent still gets its own context.
+        A persistent profile gets a browser of its own: one profile directory
+        can only be open in one Chromium.
+        """
+        if self.user_data_dir:
+            from playwright.sync_api import sync_playwright
+            
+            self.playwright = sync_playwright().start()
+            self.context = self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir, headless=headless, **LAUNCH_OPTIONS, **self.CONTEXT_OPTIONS
+            )
+            # Once; the context outlives resets
+            self.context.add_init_script(ANTI_DETECTION_SCRIPT)
+            self.context.add_init_script(ELEMENT_HELPERS_SCRIPT)
+            self.browser = self.context.browser  # None on some Playwright versions
+            return
+        
+        self._shared = _acquire_browser(headless, self.cdp_endpoint)
+        self.playwright = self._shared.playwright
+        self.browser: "Browser" = self._shared.browser
+    
+    def _new_session(self, reuse_context: bool = False):
+        """
+        Create a fresh BrowserContext and Page, and reset per-session state.
+        With reuse_context, a connected browser's existing context is used as-is
+        (its owner already configured it, so no anti-detection script is added).
+        """
+        if self.user_data_dir:
+            # The profile's one context lives as long as the agent; a new
+            # session is a fresh tab (the first reuses the startup tab)
+            pages = self.context.pages
+            self.page = pages[0] if self.page is None and pages else self.context.new_page()
+            for page in pages:
+                if page is not self.page:
+                    page.close()
+        else:
+            existing = self.browser.contexts if reuse_context else None
+            self._owns_context = not existing
+            if existing:
+                self.context: "BrowserContext" = existing[0]
+            else:
+                state = self.storage_state
+                self.context = self._open_context(state if state and os.path.exists(state) else None)
+            
+            self.page: "Page" = self.context.new_page()
+        
+        self.page.set_default_timeout(self.timeout)
+        
+        # State (element and navigation state belong to the session's pages)
+        self.command_history: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_COMMAND_HISTORY)
+        self.action_count: int = 0
+        self._rotate_at = self.CONTEXT_ROTATE_EVERY
+        self._success_count = 0  # Running totals so stats don't rescan history
+        self._failed_count = 0
+        self.element_map: ElementMap = ElementMap(max_entries=self.MAX_ELEMENTS)
+        self._element_registry = {}
+        self._next_index = 1
+        self._navigation_stack = []
+        self._page_load_metrics = {}
+    
+    def _open_context(self, storage_state=None) -> "BrowserContext":
+        """New context with the agent's options, seeded from storage_state (path or dict)."""
+        options = dict(self.CONTEXT_OPTIONS)
+        if storage_state:
+            options['storage_state'] = storage_state
+        context = self.browser.new_context(**options)
+        # Anti-detection, registered once for every page of the context
+        # (new tabs and popups included)
+        context.add_init_script(ANTI_DETECTION_SCRIPT)
+        context.add_init_script(ELEMENT_HELPERS_SCRIPT)
+        return context
+    
+    def _maybe_rotate_context(self):
+        """
+        Swap in a fresh context once CONTEXT_ROTATE_EVERY actions have run in
+        this one, carrying cookies and localStorage over. Called just before a
+        navigation, when the page (and every scanned handle) is replaced anyway.
+        Borrowed and persistent contexts are left alone.
+        """
+        if (not self.CONTEXT_ROTATE_EVERY or self.action_count < self._rotate_at
+                or self.user_data_dir or not self._owns_context):
+            return
+        
+        self._rotate_at = self.action_count + self.CONTEXT_ROTATE_EVERY
+        old_context = self.context
+        context = None
+        try:
+            context = self._open_context(old_context.storage_state())
+            page = context.new_page()
+        except Exception as e:
+            error_logger.debug("Context rotation failed: %s", e)  # Keep working in the old one
+            if context is not None:
+                context.close()
+            return
+        
+        self.context, self.page = context, page
+        self.page.set_default_timeout(self.timeout)
+        try:
+            old_context.close()
+        except Exception as e:
+            error_logger.debug("Old context close failed: %s", e)
+        
+        self.element_map.clear()
+        self._element_registry = {}
+        self._next_index = 1
+        action_logger.info("Context rotated after %d actions", self.action_count)
+    
+    def reset_session(self):
+        """
+        Start a clean session without relaunching Chromium.
+        Closes the current context (cookies, storage, tabs) and opens a new one;
+        Playwright and the browser process are kept, and a context is far
+        cheaper to create than either.
+        """
+        if not self._browser_alive():
+            raise RuntimeError("Browser is not running - restart required")
+        
+        self._is_healthy = False
+        
+        try:
+            self._close_session()
+        except Exception as e:
+            error_logger.debug("Context close failed during reset: %s", e)
+        
+        # Always a new context: a borrowed one would keep its cookies and storage
+        self._new_session()
+        
+        self._is_healthy = True
+        action_logger.info("Browser session reset")
+    
+    def _close_session(self):
+        """
+        Close this agent's context, or only its page if the context is borrowed.
+        A persistent context is kept; _new_session replaces its tabs.
+        """
+        if self.user_data_dir:
+            return
+        if self._owns_context:
+            if self.context:
+                self.context.close()
+        elif self.page:
+            self.page.close()
+    
+    def _browser_alive(self) -> bool:
+        if self.browser is not None:
+            return self.browser.is_connected()
+        return self.user_data_dir is not None and self.context is not None
+    
+    def save_storage_state(self, path: Optional[str] = None) -> bool:
+        """Write cookies and localStorage to path (default: storage_state)."""
+        path = path or self.storage_state
+        if not path or self.context is None:
+            return False
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.context.storage_state(path=path)
+        return True
+    
     # ==================== Framework-Agnostic Accessors ====================
     
     def get_current_url(self) -> str:
@@ -137,7 +539,7 @@ class BaseBrowserAgent:
         try:
             return self.page.url
         except Exception as e:
-            error_logger.debug(f"Failed to get URL: {e}")
+            error_logger.debug("Failed to get URL: %s", e)
             return "about:blank"
     
     def get_page_title(self) -> str:
@@ -146,7 +548,7 @@ class BaseBrowserAgent:
         try:
             return self.page.title()
         except Exception as e:
-            error_logger.debug(f"Failed to get title: {e}")
+            error_logger.debug("Failed to get title: %s", e)
             return ""
     
     def is_page_loaded(self) -> bool:
@@ -167,6 +569,17 @@ class BaseBrowserAgent:
     
     # ==================== Element Resolution ====================
     
+    @staticmethod
+    def _clean_selector(selector: str) -> str:
+        """
+        Strip whitespace and surrounding quotes from a selector.
+        Bare selectors (the usual case) come back without intermediate copies.
+        """
+        selector = selector.strip()
+        if selector[:1] in ('"', "'") or selector[-1:] in ('"', "'"):
+            return selector.strip('"').strip("'")
+        return selector
+    
     def _get_element(self, selector):
         """
         Resolve element by index, label, or CSS selector.
@@ -182,7 +595,7 @@ class BaseBrowserAgent:
         
         # Normalize to int if possible
         if isinstance(selector, str):
-            selector = selector.strip().strip('"').strip("'")
+            selector = self._clean_selector(selector)
             if selector.isdigit():
                 selector = int(selector)
         
@@ -205,59 +618,139 @@ class BaseBrowserAgent:
         
         # String handling - label match or CSS
         if isinstance(selector, str):
-            # Try label match (case-insensitive)
-            for meta in self.element_map.values():
-                if meta["label"].lower() == selector.lower():
-                    handle = meta.get("handle")
-                    try:
-                        if handle and not handle.is_hidden():
-                            return handle
-                    except:
-                        continue
+            # Try label match (case-insensitive, indexed); first visible wins
+            handles = [
+                handle for idx in self.element_map.find_label(selector)
+                if (handle := self.element_map[idx].get("handle"))
+            ]
+            for handle, visible in zip(handles, self._bulk_visibility(handles)):
+                if visible:
+                    return handle
             
-            # Try CSS selector as fallback
+            return self._find_on_page(selector)
+        
+        return None
+    
+    def _find_on_page(self, selector: str):
+        """
+        Resolve a selector the scan hasn't indexed: as a selector through
+        Playwright first (CSS piercing open shadow roots, text=..., xpath),
+        then, if that finds nothing, as a live label match. Hits are reused
+        for FIND_CACHE_TTL seconds, until the page navigates.
+        """
+        if self._found_page is not self.page:
+            # New tab, session or context: drop the old page's handles and
+            # forget them whenever this page navigates
+            self._found = {}
+            self._found_page = self.page
+            self.page.on("framenavigated", lambda frame: self._found.clear())
+        
+        now = time.monotonic()
+        cached = self._found.get(selector)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        try:
+            element = self.page.query_selector(selector)
+        except Exception:
+            element = None  # Not a valid selector; may still be a label
+        
+        if element is None and not _ENGINE_SELECTOR_RE.search(selector):
             try:
-                return self.page.query_selector(selector)
+                handle = self.page.evaluate_handle(FIND_LABEL_SCRIPT, selector.lower())
+                element = handle.as_element()
+                if element is None:
+                    handle.dispose()
             except Exception:
                 return None
         
-        return None
+        if element is not None:
+            if len(self._found) >= 64:  # Many distinct selectors on one page
+                self._found = {key: entry for key, entry in self._found.items() if entry[0] > now}
+            self._found[selector] = (now + self.FIND_CACHE_TTL, element)
+        return element
+    
+    def _get_element_meta(self, selector) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Resolve like _get_element, also returning the element's scan metadata
+        (tag, editable, role, ...). Metadata is None for CSS-resolved elements.
+        """
+        handle = self._get_element(selector)
+        if handle is None:
+            return None, None
+        
+        key = self._clean_selector(selector) if isinstance(selector, str) else selector
+        if isinstance(key, int) or key.isdigit():
+            return handle, self.element_map.get(int(key))
+        
+        for idx in self.element_map.find_label(key):
+            meta = self.element_map[idx]
+            if meta.get("handle") is handle:
+                return handle, meta
+        return handle, None
+    
+    def _bulk_visibility(self, handles: List[Any]) -> List[bool]:
+        """
+        Visibility of each handle, checked in a single page.evaluate.
+        Falls back to per-handle is_hidden() if any handle is stale.
+        """
+        if not handles:
+            return []
+        
+        try:
+            return self.page.evaluate(VISIBILITY_SCRIPT, handles)
+        except Exception:
+            visible = []
+            for handle in handles:
+                try:
+                    visible.append(not handle.is_hidden())
+                except Exception:
+                    visible.append(False)  # Element went stale
+            return visible
     
     # ==================== Cleanup ====================
     
     def _cleanup(self):
-        """Internal cleanup with timeouts."""
+        """
+        Internal cleanup.
+        Closing the context closes its pages; the shared browser is released
+        and only shut down by its last user (see _release_browser).
+        The sync Playwright API is bound to this thread, so no close runs elsewhere.
+        """
         errors = []
         
         # Mark as unhealthy immediately
         self._is_healthy = False
         
-        if self.page:
-            try:
-                self.page.close(timeout=self.CLEANUP_TIMEOUT)
-            except Exception as e:
-                errors.append(f"page: {e}")
-        
-        if self.context:
+        if self.context and self._browser_alive():
+            if self.storage_state and self._owns_context:
+                try:
+                    self.save_storage_state()
+                except Exception as e:
+                    errors.append(f"storage state: {e}")
             try:
-                self.context.close(timeout=self.CLEANUP_TIMEOUT)
+                if self.user_data_dir:
+                    self.context.close()  # Also closes its browser
+                else:
+                    self._close_session()
             except Exception as e:
                 errors.append(f"context: {e}")
+        self.context = None
         
-        if self.browser:
-            try:
-                self.browser.close()
-            except Exception as e:
-                errors.append(f"browser: {e}")
-        
-        if self.playwright:
+        # A persistent profile's driver is the agent's own
+        if self.user_data_dir and self.playwright:
             try:
                 self.playwright.stop()
             except Exception as e:
                 errors.append(f"playwright: {e}")
+            self.playwright = None
+        
+        shared, self._shared = self._shared, None
+        if shared is not None:
+            errors.extend(_release_browser(shared))
         
         if errors:
-            error_logger.error(f"Cleanup errors: {', '.join(errors)}")
+            error_logger.error("Cleanup errors: %s", ', '.join(errors))
     
     # ==================== Context Manager ====================
     
@@ -274,31 +767,46 @@ class BaseBrowserAgent:
         """Log command execution."""
         self.action_count += 1
         
-        entry = {
-            'timestamp': datetime.now().isoformat(),
+        # Parsed command lines are already strings
+        args = args if all(isinstance(a, str) for a in args) else [str(a) for a in args]
+        
+        self.command_history.append({
+            'ts_ns': time.time_ns(),  # Epoch nanoseconds; formatted only when displayed
             'command': cmd,
-            'args': [str(a) for a in args],
+            'args': args,
             'success': success,
             'error': error,
             'action_id': self.action_count
-        }
+        })
         
-        self.command_history.append(entry)
-        
-        args_str = ' '.join(entry['args'])
+        self._tally_command(cmd, args, success, error)
+    
+    def _count_command(self, cmd: str, args: List[str], success: bool = True, error: Optional[str] = None):
+        """log_command without the history entry; installed when RECORD_HISTORY is off."""
+        self.action_count += 1
+        self._tally_command(cmd, args, success, error)
+    
+    def _tally_command(self, cmd: str, args: List[str], success: bool, error: Optional[str]):
+        """Update the success/failure totals and log the command line."""
+        # The arg join is the only eager work; skip it when the level drops the record
         if success:
-            command_logger.info(f"[{self.action_count}] {cmd} {args_str}")
+            self._success_count += 1
+            if command_logger.isEnabledFor(logging.INFO):
+                command_logger.info("[%d] %s %s", self.action_count, cmd, ' '.join(map(str, args)))
         else:
-            error_logger.error(f"[{self.action_count}] {cmd} {args_str} - {error}")
+            self._failed_count += 1
+            if error_logger.isEnabledFor(logging.ERROR):
+                error_logger.error("[%d] %s %s - %s", self.action_count, cmd, ' '.join(map(str, args)), error)
     
     def log_action(self, action: str, details: str = "", success: bool = True):
         """Log browser actions."""
-        msg = f"{action}: {details}" if details else action
-        
         if success:
-            action_logger.info(msg)
+            if details:
+                action_logger.info("%s: %s", action, details)
+            else:
+                action_logger.info(action)
         else:
-            error_logger.error(f"{action} FAILED: {details}")
+            error_logger.error("%s FAILED: %s", action, details)
     
     # ==================== History & Stats ====================
     
@@ -311,7 +819,8 @@ class BaseBrowserAgent:
             else:
                 limit = int(limit)
         
-        recent = self.command_history[-limit:]
+        # Walk from the newest end so tailing costs O(limit), not O(history)
+        recent = list(islice(reversed(self.command_history), max(limit, 0)))[::-1]
         
         if not recent:
             console.print("[yellow]No command history yet[/yellow]")
@@ -324,21 +833,22 @@ class BaseBrowserAgent:
             color = "green" if entry['success'] else "red"
             args_str = ' '.join(entry['args'])
             cmd_display = f"{entry['command']} {args_str}".strip()
+            timestamp = format_ts_ns(entry['ts_ns'])
             
-            console.print(f"[{color}]{status}[/{color}] [{entry['action_id']:3}] {cmd_display}")
+            console.print(f"[{color}]{status}[/{color}] [{entry['action_id']:3}] [dim]{timestamp}[/dim] {cmd_display}")
         
         console.print()
     
     def get_action_stats(self):
         """Display session statistics."""
-        total = len(self.command_history)
+        successful = self._success_count
+        failed = self._failed_count
+        total = successful + failed
         
         if total == 0:
             console.print("[yellow]No actions performed yet[/yellow]")
             return
         
-        successful = sum(1 for cmd in self.command_history if cmd['success'])
-        failed = total - successful
         success_rate = (successful / total * 100) if total > 0 else 0
         
         console.print("\n[bold cyan]Session Statistics:[/bold cyan]")
@@ -353,11 +863,11 @@ class BaseBrowserAgent:
     def close(self):
         """Clean shutdown. Safe to call multiple times."""
         try:
-            action_logger.info(f"Session ended. Actions: {self.action_count}")
+            action_logger.info("Session ended. Actions: %d", self.action_count)
             self._cleanup()
             console.print("[green]Browser closed[/green]")
         except Exception as e:
-            error_logger.error(f"Shutdown error: {e}")
+            error_logger.error("Shutdown error: %s", e)
     
     def _parse_command_line(self, command_line: str):
         """PUBLIC command parser (was private)."""
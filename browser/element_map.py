@@ -0,0 +1,106 @@
+"""
+Element map container for scanned elements.
+A dict of index -> metadata that keeps a per-type histogram and a
+lowercase label index up to date, optionally bounded in size.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+
+class ElementMap(dict):
+    """
+    Dict of element index -> metadata with incremental type counts and
+    a label index.
+
+    Every write path updates type_counts and the label index, so callers
+    that only need "how many buttons/inputs/..." or "which element is
+    labelled X" avoid walking every entry.
+
+    With max_entries, writing past the limit evicts the least recently
+    written entries. Rewriting an index (an element seen again by a later
+    scan) counts as a fresh write, so long sessions keep the current
+    page's elements while memory stays bounded.
+    """
+
+    def __init__(self, *args, max_entries: Optional[int] = None, **kwargs):
+        super().__init__()
+        self.max_entries = max_entries
+        self.type_counts: Counter = Counter()
+        self._labels: Dict[str, List[int]] = {}  # Lowercased label -> indices, oldest first
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _field(meta: Dict[str, Any], name: str, default: str) -> str:
+        return (meta.get(name) or default) if isinstance(meta, dict) else default
+
+    def _index(self, key, meta: Dict[str, Any]):
+        self.type_counts[self._field(meta, 'type', 'unknown')] += 1
+        self._labels.setdefault(self._field(meta, 'label', '').lower(), []).append(key)
+
+    def _unindex(self, key, meta: Dict[str, Any]):
+        elem_type = self._field(meta, 'type', 'unknown')
+        self.type_counts[elem_type] -= 1
+        if self.type_counts[elem_type] <= 0:
+            del self.type_counts[elem_type]
+
+        label = self._field(meta, 'label', '').lower()
+        keys = self._labels.get(label)
+        if keys is not None:
+            keys.remove(key)
+            if not keys:
+                del self._labels[label]
+
+    def find_label(self, label: str) -> List[int]:
+        """Indices whose label equals label (case-insensitive), in insertion order."""
+        return list(self._labels.get(label.lower(), ()))
+
+    def first_label(self, label: str) -> Optional[int]:
+        """Oldest index labelled label (case-insensitive), or None. No list copy."""
+        keys = self._labels.get(label.lower())
+        return keys[0] if keys else None
+
+    def __setitem__(self, key, meta):
+        if key in self:
+            self._unindex(key, dict.__getitem__(self, key))
+            super().__delitem__(key)  # Re-insert at the end: most recently written
+        super().__setitem__(key, meta)
+        self._index(key, meta)
+
+        if self.max_entries is not None:
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
+    def __delitem__(self, key):
+        self._unindex(key, dict.__getitem__(self, key))
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._unindex(key, dict.__getitem__(self, key))
+        return super().pop(key, *default)
+
+    def popitem(self, last: bool = True):
+        """Remove and return the newest (or, with last=False, oldest) entry."""
+        if not last:
+            if not self:
+                raise KeyError('popitem(): element map is empty')
+            key = next(iter(self))
+            return key, self.pop(key)
+        key, meta = super().popitem()
+        self._unindex(key, meta)
+        return key, meta
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, meta in dict(*args, **kwargs).items():
+            self[key] = meta
+
+    def clear(self):
+        super().clear()
+        self.type_counts.clear()
+        self._labels.clear()
@@ -11,10 +11,54 @@ from .base_agent import console, action_logger, error_logger
 class InteractionMixin:
     """
     Element interaction commands.
-    Requires: self.page, self._get_element(), self.log_action(), self.element_map
+    Requires: self.page, self._get_element(), self._get_element_meta(), self.log_action(), self.element_map
     """
     
-    def click(self, selector: Union[int, str], force: bool = False, timeout: Optional[int] = 10000, retries: int = 2) -> bool:
+    CLICK_TIMEOUT = 10000  # ms
+    INTERACT_TIMEOUT = 5000  # ms, check/uncheck and scroll_to
+    HUMAN_TYPING_DELAY = 50  # ms between keystrokes for human_like typing
+    VERBOSE = True  # Echo successful actions; scripts driving many actions can turn this off
+    _INPUT_TAGS = frozenset({'input', 'textarea'})
+    
+    # Element kind checks. Index and label selectors carry scan metadata and
+    # are answered locally; only CSS-resolved handles cost a page round-trip.
+    
+    def _is_text_input(self, element, meta) -> bool:
+        if meta and 'tag' in meta:
+            return meta['tag'] in self._INPUT_TAGS or meta['editable'] or meta['role'] == 'textbox'
+        return self._evaluate_kind(element, "isInput", """
+            el => el.tagName === 'INPUT' || 
+                el.tagName === 'TEXTAREA' ||
+                el.isContentEditable ||
+                el.getAttribute('role') === 'textbox'
+        """)
+    
+    def _is_fillable(self, element, meta) -> bool:
+        """Text inputs Playwright's fill() accepts (not bare role=textbox widgets)."""
+        if meta and 'tag' in meta:
+            return meta['tag'] in self._INPUT_TAGS or meta['editable']
+        return self._evaluate_kind(element, "isFillable", """
+            el => el.tagName === 'INPUT' || el.tagName === 'TEXTAREA' || el.isContentEditable
+        """)
+    
+    def _is_select(self, element, meta) -> bool:
+        if meta and 'tag' in meta:
+            return meta['tag'] == 'select'
+        return self._evaluate_kind(element, "isSelect", "el => el.tagName === 'SELECT'")
+    
+    @staticmethod
+    def _evaluate_kind(element, helper: str, inline: str) -> bool:
+        """
+        Call a window.__sis helper (installed per context); pages without it
+        (a borrowed CDP context, a document loaded before the context script)
+        get the inline function instead.
+        """
+        try:
+            return element.evaluate(f"e => window.__sis.{helper}(e)")
+        except Exception:
+            return element.evaluate(inline)
+    
+    def click(self, selector: Union[int, str], force: bool = False, timeout: Optional[int] = CLICK_TIMEOUT, retries: int = 2, prescroll: bool = False) -> bool:
         """
         Click element by index, label, or CSS selector.
 
@@ -23,6 +67,8 @@ class InteractionMixin:
             force: Skip visibility checks (for covered elements)
             timeout: Override default timeout (ms)
             retries: Retry attempts on failure (default=2)
+            prescroll: Scroll into view in a separate step first. Not needed
+                normally: click scrolls as part of its actionability checks
 
         Returns:
             True if click succeeded, False otherwise
@@ -40,13 +86,14 @@ class InteractionMixin:
                     self.log_action("click", f"{selector} - not found", success=False)
                     return False
 
-                # Ensure visible/scrollable
-                element.scroll_into_view_if_needed(timeout=wait_time)
+                if prescroll:
+                    element.scroll_into_view_if_needed(timeout=wait_time)
 
-                # Click with optional force
+                # Click with optional force (scrolls into view either way)
                 element.click(force=force, timeout=wait_time)
 
-                console.print(f"[green]Clicked:[/green] {selector}")
+                if self.VERBOSE:
+                    console.print(f"[green]Clicked:[/green] {selector}")
                 self.log_action("click", str(selector), success=True)
                 return True
 
@@ -69,10 +116,10 @@ class InteractionMixin:
                 return False
 
             wait_time = timeout or self.timeout
-            element.scroll_into_view_if_needed(timeout=wait_time)
-            element.dblclick(timeout=wait_time)
+            element.dblclick(timeout=wait_time)  # Scrolls into view itself
 
-            console.print(f"[green]Double-clicked:[/green] {selector}")
+            if self.VERBOSE:
+                console.print(f"[green]Double-clicked:[/green] {selector}")
             self.log_action("double_click", str(selector), success=True)
             return True
 
@@ -92,10 +139,10 @@ class InteractionMixin:
                 return False
 
             wait_time = timeout or self.timeout
-            element.scroll_into_view_if_needed(timeout=wait_time)
-            element.click(button='right', timeout=wait_time)
+            element.click(button='right', timeout=wait_time)  # Scrolls into view itself
 
-            console.print(f"[green]Right-clicked:[/green] {selector}")
+            if self.VERBOSE:
+                console.print(f"[green]Right-clicked:[/green] {selector}")
             self.log_action("right_click", str(selector), success=True)
             return True
 
@@ -105,7 +152,7 @@ class InteractionMixin:
             return False
 
 
-    def type(self, selector: Union[int, str], text: str, clear: bool = True, delay: int = 50, timeout: Optional[int] = None) -> bool:
+    def type(self, selector: Union[int, str], text: str, clear: bool = True, delay: int = 0, timeout: Optional[int] = None, human_like: bool = False, fast: bool = False) -> bool:
         """
         Type text into input or contentEditable field.
 
@@ -113,14 +160,19 @@ class InteractionMixin:
             selector: Element index, label, or CSS selector
             text: Text to type
             clear: Clear field before typing
-            delay: Milliseconds between keystrokes (human-like typing)
+            delay: Milliseconds between keystrokes (0 sets the value in one step)
             timeout: Override default timeout (ms)
+            human_like: Type key by key with HUMAN_TYPING_DELAY unless delay is given
+            fast: Python API only (commands pass positional strings). With
+                clear=False and no delay, insert the text in one step instead
+                of key by key. Fires only an input event (no key events), so
+                key-driven widgets like autocompletes won't react
 
         Returns:
             True if typing succeeded, False otherwise
         """
         try:
-            element = self._get_element(selector)
+            element, meta = self._get_element_meta(selector)
             if not element:
                 console.print(f"[red]Element not found:[/red] {selector}")
                 self.log_action("type", f"{selector} - not found", success=False)
@@ -129,30 +181,41 @@ class InteractionMixin:
             wait_time = timeout or self.timeout
 
             # Verify it's an input / editable
-            is_input = element.evaluate("""
-                el => el.tagName === 'INPUT' || 
-                    el.tagName === 'TEXTAREA' ||
-                    el.isContentEditable ||
-                    el.getAttribute('role') === 'textbox'
-            """)
-            if not is_input:
+            if not self._is_text_input(element, meta):
                 console.print(f"[red]Not an input field:[/red] {selector}")
                 self.log_action("type", f"{selector} - not input", success=False)
                 return False
 
-            # Focus safely (instead of click, which may fail if covered)
-            element.focus()
-
-            # Clear if requested
-            if clear:
-                element.fill('', timeout=wait_time)
+            if human_like and not delay:
+                delay = self.HUMAN_TYPING_DELAY
 
-            # Type with delay
-            element.type(text, delay=delay, timeout=wait_time)
-
-            # Truncate long text in log
-            display_text = text if len(text) <= 50 else text[:47] + "..."
-            console.print(f"[green]Typed into {selector}:[/green] {display_text}")
+            fillable = self._is_fillable(element, meta)
+            if clear and not delay and fillable:
+                # Clear, set and fire input events in a single round-trip
+                element.fill(text, timeout=wait_time)
+            else:
+                # Focus safely (instead of click, which may fail if covered)
+                element.focus()
+
+                # Clear if requested; fill() rejects role=textbox widgets, so
+                # those are cleared with the keyboard
+                if clear and fillable:
+                    element.fill('', timeout=wait_time)
+                elif clear:
+                    self.page.keyboard.press("ControlOrMeta+A")
+                    self.page.keyboard.press("Backspace")
+
+                if fast and not delay:
+                    # Insert at the caret in one round-trip, no key events
+                    self.page.keyboard.insert_text(text)
+                else:
+                    # Type with delay
+                    element.type(text, delay=delay, timeout=wait_time)
+
+            if self.VERBOSE:
+                # Truncate long text in log
+                display_text = text if len(text) <= 50 else text[:47] + "..."
+                console.print(f"[green]Typed into {selector}:[/green] {display_text}")
             self.log_action("type", f"{selector} ({len(text)} chars)", success=True)
             return True
 
@@ -162,6 +225,83 @@ class InteractionMixin:
             return False
 
     
+    # Sets each [element, text] pair the way fill() does: native value setter
+    # (so framework-controlled inputs notice) plus input/change events. The
+    # setter is looked up the prototype chain, so subclassed built-ins work;
+    # a field that throws counts as not filled without failing the others.
+    _FILL_MANY_SCRIPT = """
+        pairs => pairs.map(([el, text]) => {
+            if (!el || !el.isConnected) return false;
+            try {
+                el.focus();
+                if (el.isContentEditable) {
+                    el.textContent = text;
+                } else if ('value' in el) {
+                    let setter;
+                    for (let proto = Object.getPrototypeOf(el); proto && !setter;
+                            proto = Object.getPrototypeOf(proto)) {
+                        setter = Object.getOwnPropertyDescriptor(proto, 'value')?.set;
+                    }
+                    if (setter) setter.call(el, text); else el.value = text;
+                } else {
+                    return false;
+                }
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+                return true;
+            } catch (e) {
+                return false;
+            }
+        })
+    """
+
+    def fill_many(self, *args) -> bool:
+        """
+        Fill several fields in one page round-trip.
+
+        Args:
+            args: Alternating selector and text (fill_many 1 "alice" 2 "secret"),
+                or a single dict of selector -> text
+
+        Returns:
+            True if every field was filled
+        """
+        if len(args) == 1 and isinstance(args[0], dict):
+            fields = list(args[0].items())
+        elif args and len(args) % 2 == 0:
+            fields = list(zip(args[::2], args[1::2]))
+        else:
+            console.print("[red]Usage:[/red] fill_many <selector> <text> [<selector> <text> ...]")
+            self.log_action("fill_many", "bad arguments", success=False)
+            return False
+
+        pairs = []
+        for selector, text in fields:
+            element, meta = self._get_element_meta(selector)
+            if not element or not self._is_text_input(element, meta):
+                console.print(f"[red]Not an input field:[/red] {selector}")
+                self.log_action("fill_many", f"{selector} - not input", success=False)
+                return False
+            pairs.append([element, str(text)])
+
+        try:
+            filled = self.page.evaluate(self._FILL_MANY_SCRIPT, pairs)
+        except Exception as e:
+            console.print(f"[red]Fill failed:[/red] {e}")
+            self.log_action("fill_many", str(e), success=False)
+            return False
+
+        failed = [str(selector) for (selector, _), ok in zip(fields, filled) if not ok]
+        if failed:
+            console.print(f"[red]Could not fill:[/red] {', '.join(failed)}")
+            self.log_action("fill_many", f"failed: {', '.join(failed)}", success=False)
+            return False
+
+        if self.VERBOSE:
+            console.print(f"[green]Filled {len(pairs)} fields[/green]")
+        self.log_action("fill_many", f"{len(pairs)} fields", success=True)
+        return True
+
     def press_key(self, key: str) -> bool:
         """
         Press keyboard key (e.g., 'Enter', 'Escape', 'Tab').
@@ -175,7 +315,8 @@ class InteractionMixin:
         try:
             self.page.keyboard.press(key)
             
-            console.print(f"[green]Pressed:[/green] {key}")
+            if self.VERBOSE:
+                console.print(f"[green]Pressed:[/green] {key}")
             self.log_action("press_key", key, success=True)
             return True
             
@@ -205,13 +346,13 @@ class InteractionMixin:
                 return False
 
             wait_time = timeout or self.timeout
-            element.scroll_into_view_if_needed(timeout=wait_time)
-            element.hover(timeout=wait_time)
+            element.hover(timeout=wait_time)  # Scrolls into view itself
 
             if duration > 0:
                 time.sleep(duration / 1000)
 
-            console.print(f"[green]Hovering:[/green] {selector} (duration={duration}ms)")
+            if self.VERBOSE:
+                console.print(f"[green]Hovering:[/green] {selector} (duration={duration}ms)")
             self.log_action("hover", f"{selector} ({duration}ms)", success=True)
             return True
 
@@ -243,15 +384,14 @@ class InteractionMixin:
             True if selection succeeded
         """
         try:
-            element = self._get_element(selector)
+            element, meta = self._get_element_meta(selector)
             if not element:
                 console.print(f"[red]Element not found:[/red] {selector}")
                 self.log_action("select_option", f"{selector} - not found", success=False)
                 return False
 
             # Verify <select>
-            is_select = element.evaluate("el => el.tagName === 'SELECT'")
-            if not is_select:
+            if not self._is_select(element, meta):
                 console.print(f"[red]Not a select element:[/red] {selector}")
                 self.log_action("select_option", f"{selector} - not select", success=False)
                 return False
@@ -270,7 +410,8 @@ class InteractionMixin:
             element.select_option(timeout=wait_time, **args)
 
             chosen = f"value={value}" if value else f"label={label}" if label else f"index={index}"
-            console.print(f"[green]Selected {chosen} in {selector}[/green]")
+            if self.VERBOSE:
+                console.print(f"[green]Selected {chosen} in {selector}[/green]")
             self.log_action("select_option", f"{selector} → {chosen}", success=True)
             return True
 
@@ -300,13 +441,14 @@ class InteractionMixin:
                 return False
             
             if checked:
-                element.check(timeout=5000)
+                element.check(timeout=self.INTERACT_TIMEOUT)
                 action = "Checked"
             else:
-                element.uncheck(timeout=5000)
+                element.uncheck(timeout=self.INTERACT_TIMEOUT)
                 action = "Unchecked"
             
-            console.print(f"[green]{action}:[/green] {selector}")
+            if self.VERBOSE:
+                console.print(f"[green]{action}:[/green] {selector}")
             self.log_action("check", f"{selector} → {checked}", success=True)
             return True
             
@@ -333,9 +475,10 @@ class InteractionMixin:
                 self.log_action("scroll_to", f"{selector} - not found", success=False)
                 return False
             
-            element.scroll_into_view_if_needed(timeout=5000)
+            element.scroll_into_view_if_needed(timeout=self.INTERACT_TIMEOUT)
             
-            console.print(f"[green]Scrolled to:[/green] {selector}")
+            if self.VERBOSE:
+                console.print(f"[green]Scrolled to:[/green] {selector}")
             self.log_action("scroll_to", str(selector), success=True)
             return True
             
@@ -7,7 +7,7 @@ from typing import Optional, Dict, List, Literal
 from urllib.parse import urlparse, urljoin
 from datetime import datetime
 import time
-from .base_agent import console, action_logger, error_logger
+from .base_agent import console, action_logger, error_logger, format_ts_ns
 
 
 class NavigationMixin:
@@ -53,6 +53,7 @@ class NavigationMixin:
             
             # Navigate - simple commit wait (fastest, most reliable)
             console.print(f"[cyan]Navigating to:[/cyan] {processed_url}")
+            self._maybe_rotate_context()
             
             try:
                 response = self.page.goto(
@@ -72,9 +73,10 @@ class NavigationMixin:
                 console.print(f"[red]Navigation failed:[/red] {error_msg}")
                 
                 # Provide helpful suggestions
-                if "timeout" in error_msg.lower():
+                error_lower = error_msg.lower()
+                if "timeout" in error_lower:
                     console.print("[dim]Tip: Page might be very slow or unreachable[/dim]")
-                elif "net::" in error_msg.lower() or "DNS" in error_msg:
+                elif "net::" in error_lower or "DNS" in error_msg:
                     console.print("[dim]Tip: Check URL spelling and internet connection[/dim]")
                 
                 self.log_action("navigate", f"{url} - {error_msg}", success=False)
@@ -465,12 +467,8 @@ class NavigationMixin:
             console.print("─" * 90)
             
             for entry in reversed(nav_entries):  # Most recent first
-                # Format timestamp
-                try:
-                    dt = datetime.fromisoformat(entry['timestamp'])
-                    timestamp = dt.strftime("%H:%M:%S")
-                except:
-                    timestamp = entry['timestamp'].split('T')[1].split('.')[0]
+                # Format timestamp (stored as epoch nanoseconds)
+                timestamp = format_ts_ns(entry['ts_ns'])
                 
                 # Status indicator
                 status = "" if entry['success'] else ""
@@ -514,7 +512,7 @@ class NavigationMixin:
             
         except Exception as e:
             console.print(f"[red]Failed to display history:[/red] {e}")
-            error_logger.debug(f"History error: {e}")
+            error_logger.debug("History error: %s", e)
             self.log_action("history", str(e), success=False)
             return False
     
@@ -8,6 +8,13 @@ from collections import defaultdict
 import hashlib
 from .base_agent import console, action_logger, error_logger
 
+# Tag, editability and role of every candidate in one round-trip; kept in
+# the element map so interactions can check an element's kind without
+# asking the page again
+ELEMENT_KIND_SCRIPT = """
+    els => els.map(el => [el.tagName.toLowerCase(), el.isContentEditable, el.getAttribute('role')])
+"""
+
 @dataclass
 class ElementData:
     """Rich element metadata with scoring."""
@@ -21,6 +28,8 @@ class ElementData:
     href: Optional[str] = None
     parent_context: Optional[str] = None
     is_primary_action: bool = False
+    editable: bool = False  # contentEditable
+    role: Optional[str] = None  # ARIA role attribute
     metadata: Dict = field(default_factory=dict)
 
 class ScanningMixin:
@@ -163,8 +172,7 @@ class ScanningMixin:
             
         except Exception as e:
             console.print(f"[red]Scan failed:[/red] {e}")
-            import traceback
-            error_logger.debug(traceback.format_exc())
+            error_logger.debug("Scan failed", exc_info=True)  # Traceback formatted only if emitted
             self.log_action("scan", str(e), success=False)
             return False
     
@@ -190,7 +198,9 @@ class ScanningMixin:
                 dynamic_elements = self._find_dynamic_elements(elem_type)
                 found_elements.extend(dynamic_elements)
             
-            for element in found_elements:
+            kinds = self.page.evaluate(ELEMENT_KIND_SCRIPT, found_elements) if found_elements else []
+            
+            for element, (tag, editable, role) in zip(found_elements, kinds):
                 try:
                     # Check visibility
                     is_visible = element.is_visible()
@@ -209,7 +219,6 @@ class ScanningMixin:
                     seen_ids.add(stable_id)
                     
                     # Extract metadata
-                    tag = element.evaluate("el => el.tagName.toLowerCase()")
                     label = self._extract_advanced_label(element, tag)
                     
                     if not label or label.startswith("Unnamed"):
@@ -251,18 +260,20 @@ class ScanningMixin:
                         score=score,
                         href=href,
                         parent_context=parent_context,
-                        is_primary_action=is_primary
+                        is_primary_action=is_primary,
+                        editable=editable,
+                        role=role
                     )
                     
                     elements.append(elem_data)
                     self._element_registry[stable_id] = elem_data
                     
                 except Exception as e:
-                    error_logger.debug(f"Skipped element in {elem_type}: {e}")
+                    error_logger.debug("Skipped element in %s: %s", elem_type, e)
                     continue
         
         except Exception as e:
-            error_logger.warning(f"Failed to scan {elem_type}: {e}")
+            error_logger.warning("Failed to scan %s: %s", elem_type, e)
         
         return elements
     
@@ -295,7 +306,7 @@ class ScanningMixin:
                         continue
         
         except Exception as e:
-            error_logger.debug(f"Dynamic scan failed: {e}")
+            error_logger.debug("Dynamic scan failed: %s", e)
         
         return dynamic_elements
     
@@ -472,7 +483,7 @@ class ScanningMixin:
             return f"Unnamed {tag}"
             
         except Exception as e:
-            error_logger.debug(f"Label extraction failed: {e}")
+            error_logger.debug("Label extraction failed: %s", e)
             return f"Unnamed {tag}"
     
     def _extract_url_label(self, href: str) -> Optional[str]:
@@ -714,7 +725,18 @@ class ScanningMixin:
                 'type': elem.type,
                 'handle': elem.handle,
                 'stable_id': elem.stable_id,
-                'score': elem.score
+                'score': elem.score,
+                'tag': elem.tag,
+                'editable': elem.editable,
+                'role': elem.role
+            }
+        
+        # Keep the stable-id registry from outgrowing the (bounded) map
+        limit = self.element_map.max_entries
+        if limit is not None and len(self._element_registry) > limit:
+            self._element_registry = {
+                stable_id: elem for stable_id, elem in self._element_registry.items()
+                if elem.index in self.element_map
             }
     
     def _display_advanced_results(
@@ -896,8 +918,7 @@ class ScanningMixin:
             
         except Exception as e:
             console.print(f"[red]Failed to get element info:[/red] {e}")
-            import traceback
-            error_logger.debug(traceback.format_exc())
+            error_logger.debug("Element info failed", exc_info=True)  # Traceback formatted only if emitted
             self.log_action("element_info", str(e), success=False)
             return False
     
@@ -1037,13 +1058,10 @@ class ScanningMixin:
             'total_elements': len(self.element_map),
             'registry_size': len(self._element_registry),
             'next_index': self._next_index,
-            'types': defaultdict(int)
+            'types': dict(self.element_map.type_counts)
         }
         
-        for meta in self.element_map.values():
-            stats['types'][meta['type']] += 1
-        
-        return dict(stats)
+        return stats
     
     def print_stats(self):
         """Print scanning statistics."""
@@ -1365,7 +1383,6 @@ class ScanningMixin:
             
         except Exception as e:
             console.print(f"[red]Failed to read page:[/red] {e}")
-            import traceback
-            error_logger.debug(traceback.format_exc())
+            error_logger.debug("Read page failed", exc_info=True)  # Traceback formatted only if emitted
             self.log_action("read_page", str(e), success=False)
             return f"Error reading page: {e}"
\ No newline at end of file
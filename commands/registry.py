@@ -123,6 +123,13 @@ COMMAND_SPECS = [
         description='Type into input field',
         category='Interaction'
     ),
+    CommandSpec(
+        name='fill_many',
+        method_name='fill_many',
+        syntax='fill_many <selector> "text" [<selector> "text" ...]',
+        description='Fill several fields in one round-trip',
+        category='Interaction'
+    ),
     CommandSpec(
         name='press',
         method_name='press_key',
@@ -170,7 +177,7 @@ COMMAND_SPECS = [
     CommandSpec(
         name='scan',
         method_name='scan',
-        syntax='scan [filter]',
+        syntax='scan [buttons|inputs|links|all]',
         description='Scan page (filter: buttons, inputs, links, etc.)',
         category='Scanning'
     ),
@@ -228,7 +235,7 @@ COMMAND_SPECS = [
     CommandSpec(
         name='read_page',
         method_name='read_page',
-        syntax='read_page [focus]',
+        syntax='read_page [overview|content|forms|navigation|all]',
         description='Extract page content (overview/content/forms/navigation/all)',
         category='Information'
     ),
@@ -236,6 +243,11 @@ COMMAND_SPECS = [
 ]
 
 
+# Categories (in order) exposed to the LLM, and commands it should never use
+PROMPT_CATEGORIES = ['Navigation', 'Interaction', 'Scanning', 'Information']
+PROMPT_EXCLUDED_COMMANDS = {'history', 'nav_history', 'home', 'tabs', 'fill_many'}
+
+
 # ============================================================================
 # REGISTRY BUILDERS
 # ============================================================================
@@ -307,38 +319,25 @@ def get_commands_by_category() -> Dict[str, List[str]]:
 
 def get_system_prompt_commands() -> str:
     """
-    Generate the AVAILABLE COMMANDS section for system prompt.
+    Generate the compact command table for the system prompt.
+    
+    One line per category keeps the prompt short: the model re-reads it
+    on every call, so each token here is paid once per step.
     
     Returns:
-        Formatted string with all commands for LLM
+        Formatted string with all LLM-usable commands
     """
-    categories = get_commands_by_category()
-    
-    lines = ["AVAILABLE COMMANDS (use these exact tokens)"]
+    lines = []
     
-    for category in ['Navigation', 'Interaction', 'Scanning', 'System']:
-        if category not in categories:
-            continue
-            
-        lines.append(f"\n{category.upper()}:")
-        
-        for spec in COMMAND_SPECS:
-            if spec.category != category:
-                continue
-            
-            # Format command with aliases
-            cmd_line = f"  {spec.name}"
-            if spec.syntax != spec.name:
-                # Extract args from syntax
-                args = spec.syntax[len(spec.name):].strip()
-                if args:
-                    cmd_line += f" {args}"
-            
-            lines.append(cmd_line)
-            
-            # Add aliases as comments
-            for alias in spec.aliases:
-                lines.append(f"  {alias}          # alias for {spec.name}")
+    # Sorted so the text is byte-identical regardless of COMMAND_SPECS order,
+    # which keeps the provider's prompt-prefix cache warm
+    for category in PROMPT_CATEGORIES:
+        syntaxes = [
+            spec.syntax for spec in sorted(COMMAND_SPECS, key=lambda s: s.name)
+            if spec.category == category and spec.name not in PROMPT_EXCLUDED_COMMANDS
+        ]
+        if syntaxes:
+            lines.append(f"{category}: {' | '.join(syntaxes)}")
     
     return "\n".join(lines)
 
@@ -0,0 +1,253 @@
+"""
+Response caches for LLM calls.
+ResponseCache: bounded LRU keyed on a hash of the request, optionally persisted to disk.
+SemanticCache: nearest-neighbour lookup over embeddings of the agent's state,
+optionally persisted to disk.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class ResponseCache:
+    """
+    LRU cache mapping request hashes to LLM responses.
+
+    Entries are evicted least-recently-used once max_entries is reached.
+    When a path is given the cache is loaded from and saved to a JSON file,
+    so repeated tasks hit across runs.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".sisyphus", "llm_cache.json")
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()  # LLM calls run on worker threads
+        self._dirty = False
+        self.stats = {"hits": 0, "misses": 0}
+
+        if path:
+            self._load()
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """SHA-256 of the request payload (model, messages, ...) as canonical JSON."""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response (marking it recently used) or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store response, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        """Load entries from disk, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                pairs = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, value in pairs[-self.max_entries:]:
+            self._entries[key] = value
+
+    def save(self):
+        """Write entries to disk if anything changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+
+        with self._lock:
+            pairs = list(self._entries.items())
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pairs, f)
+        os.replace(tmp_path, self.path)
+
+
+# Loaded encoders by model name, shared by every SemanticCache in the process
+_ENCODERS: Dict[str, Any] = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def _get_encoder(model_name: str):
+    """Load a SentenceTransformer once per process and keep it warm."""
+    with _ENCODERS_LOCK:
+        encoder = _ENCODERS.get(model_name)
+        if encoder is None:
+            from sentence_transformers import SentenceTransformer
+            encoder = _ENCODERS[model_name] = SentenceTransformer(model_name, device="cpu")
+        return encoder
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour response cache over sentence embeddings.
+
+    A lookup embeds a short description of the agent's state and reuses the
+    stored response whose key is most similar, if cosine similarity clears
+    the threshold. An exact hash of the key text is checked first, so
+    repeated states skip the embedding entirely. Embeddings are held as
+    float16 and the least recently used entry is replaced once max_entries
+    is reached. When a path is given the cache persists across runs as
+    <path>.npz (embeddings) plus <path>.json (key hashes and responses).
+    Needs the optional numpy and sentence-transformers packages.
+    """
+
+    DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".sisyphus", "semantic_cache")
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 500,
+                 model_name: str = DEFAULT_MODEL, path: Optional[str] = None):
+        try:
+            import numpy as np
+            self._encoder = _get_encoder(model_name)
+        except ImportError:
+            raise ImportError(
+                "Semantic cache requires numpy and sentence-transformers. "
+                "Install with: pip install numpy sentence-transformers"
+            )
+
+        self._np = np
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self._dirty = False
+
+        dim = self._encoder.get_sentence_embedding_dimension()
+        self._keys = np.empty((0, dim), dtype=np.float16)  # Unit-normalised rows
+        self._hashes: List[str] = []
+        self._values: List[str] = []
+        self._rows: Dict[str, int] = {}  # Key hash -> row
+        self._last_used: List[int] = []  # Per row, for LRU replacement
+        self._clock = 0
+
+        if path:
+            self._load()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _embed(self, text: str):
+        return self._encoder.encode(
+            text, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(self._np.float32)
+
+    def _touch(self, row: int) -> str:
+        self._clock += 1
+        self._last_used[row] = self._clock
+        return self._values[row]
+
+    def get(self, text: str) -> Optional[str]:
+        """Return the response for an identical or most similar cached state, or None."""
+        if not self._values:
+            return None
+
+        row = self._rows.get(self._hash(text))
+        if row is not None:
+            return self._touch(row)
+
+        # Rows and query are unit vectors, so the dot product is cosine similarity.
+        # Stored as float16, promoted for the matrix product.
+        sims = self._keys.astype(self._np.float32) @ self._embed(text)
+        best = int(sims.argmax())
+        if sims[best] >= self.threshold:
+            return self._touch(best)
+        return None
+
+    def put(self, text: str, value: str):
+        """Store a response, replacing the least recently used entry when full."""
+        key_hash = self._hash(text)
+        row = self._rows.get(key_hash)
+        if row is not None:
+            if self._values[row] != value:
+                self._values[row] = value
+                self._dirty = True
+            self._touch(row)
+            return
+
+        embedding = self._embed(text).astype(self._np.float16)
+        if len(self._values) < self.max_entries:
+            row = len(self._values)
+            self._keys = self._np.vstack([self._keys, embedding])
+            self._hashes.append(key_hash)
+            self._values.append(value)
+            self._last_used.append(0)
+        else:
+            row = min(range(len(self._last_used)), key=self._last_used.__getitem__)
+            del self._rows[self._hashes[row]]
+            self._keys[row] = embedding
+            self._hashes[row] = key_hash
+            self._values[row] = value
+
+        self._rows[key_hash] = row
+        self._touch(row)
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _load(self):
+        """Load entries from disk, ignoring missing, corrupt or mismatched files."""
+        np = self._np
+        try:
+            with open(self.path + ".json", 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            with np.load(self.path + ".npz") as data:
+                keys = data["keys"].astype(np.float16)
+        except (OSError, ValueError, KeyError):
+            return
+
+        if len(records) != len(keys) or keys.shape[1:] != self._keys.shape[1:]:
+            return  # Written by a different embedding model
+
+        # Files are written least recently used first
+        records = records[-self.max_entries:]
+        self._keys = keys[-self.max_entries:]
+        self._hashes = [key_hash for key_hash, _ in records]
+        self._values = [value for _, value in records]
+        self._rows = {key_hash: row for row, key_hash in enumerate(self._hashes)}
+        self._last_used = list(range(1, len(records) + 1))
+        self._clock = len(records)
+
+    def save(self):
+        """Write entries to disk if anything changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+
+        order = sorted(range(len(self._values)), key=self._last_used.__getitem__)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".npz.tmp", 'wb') as f:
+            self._np.savez(f, keys=self._keys[order])
+        with open(self.path + ".json.tmp", 'w', encoding='utf-8') as f:
+            json.dump([(self._hashes[row], self._values[row]) for row in order], f)
+        os.replace(self.path + ".npz.tmp", self.path + ".npz")
+        os.replace(self.path + ".json.tmp", self.path + ".json")
+        self._dirty = False
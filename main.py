@@ -7,6 +7,7 @@ Entry point for the integrated agent.
 from browser import BaseBrowserAgent, NavigationMixin, InteractionMixin, ScanningMixin, console
 from commands import build_command_registry, get_command_help
 from datetime import datetime
+from repl_input import make_reader
 import sys
 
 from commands.registry import (
@@ -16,6 +17,8 @@ from commands.registry import (
     find_command_spec
 )
 
+EXIT_COMMANDS = frozenset({'exit', 'quit', 'q'})
+
 class BrowserAgent(BaseBrowserAgent, NavigationMixin, InteractionMixin, ScanningMixin):
     """
     Complete browser agent combining all mixins.
@@ -37,23 +40,29 @@ class BrowserAgent(BaseBrowserAgent, NavigationMixin, InteractionMixin, Scanning
         
         # String handling
         if isinstance(selector, str):
-            selector = selector.strip().strip('"').strip("'")
+            selector = self._clean_selector(selector)
             
             # Numeric string -> index lookup
             if selector.isdigit():
                 idx = int(selector)
                 return self.element_map.get(idx, {}).get("handle")
             
-            # Label match (case-insensitive)
-            for meta in self.element_map.values():
-                if meta["label"].lower() == selector.lower():
-                    return meta["handle"]
+            # Label match (case-insensitive, indexed). A unique label needs no
+            # page round-trip; duplicates go to the first visible one, checked
+            # in a single evaluate
+            indices = self.element_map.find_label(selector)
+            if len(indices) == 1:
+                return self.element_map[indices[0]]["handle"]
+            if indices:
+                handles = [handle for idx in indices if (handle := self.element_map[idx].get("handle"))]
+                for handle, visible in zip(handles, self._bulk_visibility(handles)):
+                    if visible:
+                        return handle
+                if handles:
+                    return handles[0]
             
-            # CSS selector fallback
-            try:
-                return self.page.query_selector(selector)
-            except Exception:
-                return None
+            # CSS selector, then live label match
+            return self._find_on_page(selector)
         
         return None
     
@@ -120,6 +129,10 @@ def run_repl(agent: BrowserAgent):
         agent: Initialized BrowserAgent instance
     """
     commands = build_command_registry(agent)
+    read_line = make_reader(
+        lambda: console.input("[bold blue]> [/bold blue]"),
+        "> ", "bold ansiblue", history="repl_history", words=commands
+    )
     
     console.print("\n[bold green]Browser Agent Ready[/bold green]")
     console.print("[dim]Type 'help' for commands, 'exit' to quit[/dim]\n")
@@ -127,7 +140,7 @@ def run_repl(agent: BrowserAgent):
     while True:
         try:
             # Get user input
-            command_line = console.input("[bold blue]> [/bold blue]").strip()
+            command_line = read_line().strip()
             
             if not command_line:
                 continue
@@ -146,15 +159,16 @@ def run_repl(agent: BrowserAgent):
             args = parts[1:]
             
             # Handle exit
-            if cmd in ['exit', 'quit', 'q']:
+            if cmd in EXIT_COMMANDS:
                 agent.log_command(cmd, args, success=True)
                 console.print("[yellow]Shutting down...[/yellow]")
                 break
             
-            # Execute command
-            if cmd in commands:
+            # Execute command (registry keys are already lower-case)
+            handler = commands.get(cmd)
+            if handler is not None:
                 try:
-                    commands[cmd](*args)
+                    handler(*args)
                     agent.log_command(cmd, args, success=True)
                 except TypeError as e:
                     # Wrong number of arguments
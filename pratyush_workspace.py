@@ -4,9 +4,10 @@ Anay's experimental workspace.
 Full REPL with all standard commands PLUS experimental features.
 """
 
-from main import BrowserAgent, run_repl
+from main import BrowserAgent, EXIT_COMMANDS, run_repl
 from browser import console
 from commands import build_command_registry
+from repl_input import make_reader
 import sys
 
 
@@ -457,13 +458,18 @@ def run_experimental_repl(agent: ExperimentalAgent):
     commands['clear_cache'] = agent.clear_cache
     commands['read_page'] = agent.read_page
     
+    read_line = make_reader(
+        lambda: console.input("[bold magenta]exp> [/bold magenta]"),
+        "exp> ", "bold ansimagenta", history="exp_history", words=commands
+    )
+    
     console.print("\n[bold magenta] Experimental Workspace[/bold magenta]")
     console.print("[yellow]Extra commands: wiki_test, screenshot, new_tab, close_tab, switch_tab, tabs, clear_cache, text_all[/yellow]")
     console.print("[dim]Type 'help' for standard commands, 'exit' to quit[/dim]\n")
     
     while True:
         try:
-            command_line = console.input("[bold magenta]exp> [/bold magenta]").strip()
+            command_line = read_line().strip()
             
             if not command_line:
                 continue
@@ -478,14 +484,15 @@ def run_experimental_repl(agent: ExperimentalAgent):
             cmd = parts[0].lower()
             args = parts[1:]
             
-            if cmd in ['exit', 'quit', 'q']:
+            if cmd in EXIT_COMMANDS:
                 agent.log_command(cmd, args, success=True)
                 console.print("[yellow]Shutting down...[/yellow]")
                 break
             
-            if cmd in commands:
+            handler = commands.get(cmd)
+            if handler is not None:
                 try:
-                    commands[cmd](*args)
+                    handler(*args)
                     agent.log_command(cmd, args, success=True)
                 except TypeError as e:
                     console.print(f"[red]Invalid arguments:[/red] {e}")
@@ -0,0 +1,56 @@
+"""
+Line input for the REPLs.
+Uses a prompt_toolkit session (persistent history, suggestions, command
+completion) when the optional package is installed and stdin is a terminal,
+otherwise falls back to the console's plain input.
+"""
+
+import os
+import sys
+from typing import Callable, Iterable
+
+HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".sisyphus")
+
+
+def make_reader(
+    fallback: Callable[[], str],
+    message: str,
+    style: str = "",
+    history: str = "history",
+    words: Iterable[str] = ()
+) -> Callable[[], str]:
+    """
+    Build a read-one-line callable for a REPL loop.
+
+    Args:
+        fallback: Plain reader used without prompt_toolkit (e.g. console.input)
+        message: Prompt text
+        style: prompt_toolkit style for the prompt (e.g. 'bold ansiblue')
+        history: File name under ~/.sisyphus for this REPL's input history
+        words: Words to tab-complete (command names)
+
+    Returns:
+        Callable returning the raw line; raises EOFError/KeyboardInterrupt like input()
+    """
+    if not sys.stdin.isatty():
+        return fallback  # Piped input: nothing to edit or complete
+
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+    except ImportError:
+        return fallback
+
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    words = sorted(words)
+    # One session for the whole loop, so history and key bindings are set up once
+    session = PromptSession(
+        history=FileHistory(os.path.join(HISTORY_DIR, history)),
+        auto_suggest=AutoSuggestFromHistory(),
+        completer=WordCompleter(words) if words else None
+    )
+    prompt = [(style, message)]
+
+    return lambda: session.prompt(prompt)
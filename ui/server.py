@@ -276,7 +276,7 @@ class CombinedVideoServer:
         self.task_cancelled.clear()
         
         agent.step_count = 0
-        agent.conversation_history = []
+        agent._reset_conversation()
         self.task_state = {
             'task': task,
             'state': 'prompt_llm',
@@ -319,18 +319,18 @@ class CombinedVideoServer:
             
             elif state['state'] == 'parse_response':
                 parsed = agent._parse_response(state['llm_response'])
-                if 'error' in parsed:
-                    self.task_response_queue.put({'type': 'parse_error', 'error': parsed['error']})
-                    retry_prompt = f"Invalid format: {parsed['error']}. Retry."
+                if parsed.error is not None:
+                    self.task_response_queue.put({'type': 'parse_error', 'error': parsed.error})
+                    retry_prompt = f"Invalid format: {parsed.error}. Retry."
                     state['future'] = self.executor.submit(agent._call_llm, retry_prompt)
                     state['state'] = 'awaiting_llm_response'
                     return
 
-                if parsed.get('done'):
+                if parsed.done:
                     self.task_response_queue.put({
                         'type': 'task_completed',
-                        'reasoning': parsed.get('thinking', ''),
-                        'finish_message': parsed.get('finish_message', ''),
+                        'reasoning': parsed.thinking,
+                        'finish_message': parsed.finish_message,
                         'command_history': state['commands'],
                     })
                     self.task_state = None
@@ -349,25 +349,25 @@ class CombinedVideoServer:
                 parsed = state['parsed']
                 cmd_entry = {
                     'step': agent.step_count,
-                    'command': parsed['command'],
-                    'thinking': parsed.get('thinking', '')
+                    'command': parsed.command,
+                    'thinking': parsed.thinking
                 }
                 state['commands'].append(cmd_entry)
                 
                 # Create terminal message for this step only
-                term_msg = f"\n--- Step {agent.step_count} ---\nThinking: {parsed.get('thinking', '')}\nCommand: {parsed['command']}\n"
+                term_msg = f"\n--- Step {agent.step_count} ---\nThinking: {parsed.thinking}\nCommand: {parsed.command}\n"
                 state['terminal'].append(term_msg)
                 
                 # Send only the NEW terminal line, not entire history
                 self.task_response_queue.put({
                     'type': 'step_start',
                     'step': agent.step_count,
-                    'command': parsed['command'],
-                    'thinking': parsed.get('thinking', ''),
+                    'command': parsed.command,
+                    'thinking': parsed.thinking,
                     'command_history': list(state['commands']),
                     'terminal_line': term_msg  # Only send the new line
                 })
-                state['command_to_execute'] = parsed['command']
+                state['command_to_execute'] = parsed.command
                 state['state'] = 'execute_command'
 
             elif state['state'] == 'execute_command':